@@ -11,7 +11,9 @@ Supports two modes:
 # Early error capture - catch any import errors
 import sys
 import os
+import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Capture startup errors to display later
 _STARTUP_ERROR = None
@@ -21,6 +23,10 @@ try:
     import pandas as pd
     import requests
     from dotenv import load_dotenv
+    # Compressions requests can decode: gzip/deflate, plus br/zstd when installed
+    from urllib3.util.request import ACCEPT_ENCODING
+    from universe_cache import UniverseCache
+    from wire_format import accept_header, decode_screen_response, decode_stream_event, stream_accept_header
     
     # Load environment variables
     load_dotenv()
@@ -45,15 +51,17 @@ CLERK_PUBLISHABLE_KEY = os.getenv("CLERK_PUBLISHABLE_KEY", "")
 # Determine if we're in SaaS mode (has API backend) or local mode
 SAAS_MODE = bool(API_URL)
 
+# Number of symbols fetched at once in local mode
+LOCAL_SCREEN_WORKERS = int(os.getenv("LOCAL_SCREEN_WORKERS", "8"))
+
 # Import local modules only in local mode
 LOCAL_MODE_ERROR = None
 if not SAAS_MODE:
     try:
         from options_screener import (
             load_config,
-            calculate_metrics,
-            screen_options,
-            format_output,
+            prepare_universe,
+            screen_universe,
             save_config_file,
             get_options_chain_massive,
             get_options_chain_yahoo,
@@ -61,6 +69,7 @@ if not SAAS_MODE:
             get_stock_price_yahoo,
         )
         from massive_api_client import massive_client
+        from price_service import get_spot_prices
     except Exception as e:
         LOCAL_MODE_ERROR = f"{type(e).__name__}: {str(e)}\n\nTraceback:\n{traceback.format_exc()}"
         massive_client = None
@@ -77,14 +86,11 @@ if not SAAS_MODE:
         def save_config_file(config):
             pass
         
-        def calculate_metrics(options, current_price):
-            return options
-        
-        def screen_options(options, config):
-            return options
+        def prepare_universe(chains, prices):
+            return pd.DataFrame()
         
-        def format_output(filtered, current_price):
-            return filtered
+        def screen_universe(universe, config):
+            return {}
         
         def get_options_chain_massive(symbol, config):
             return pd.DataFrame()
@@ -97,6 +103,9 @@ if not SAAS_MODE:
         
         def get_stock_price_yahoo(symbol):
             return None
+        
+        def get_spot_prices(symbols):
+            return {}
 else:
     massive_client = None
     
@@ -369,6 +378,10 @@ if 'stop_processing' not in st.session_state:
 if 'used_yahoo' not in st.session_state:
     st.session_state.used_yahoo = False
 
+# Local mode: fetched chains with metrics, reused when only criteria change
+if not isinstance(st.session_state.get('universe'), UniverseCache):
+    st.session_state.universe = UniverseCache()
+
 # SaaS mode session state
 if 'user_info' not in st.session_state:
     st.session_state.user_info = None
@@ -582,10 +595,10 @@ def get_live_config():
     }
 
 
-def fetch_data_with_fallback_local(symbol, config):
+def fetch_chain_with_fallback_local(symbol, config):
     """
-    Local mode: Fetch data directly using Massive.com/Yahoo APIs.
-    Returns (formatted_results_df or None, message, yahoo_used: bool)
+    Local mode: Fetch price and options chain directly using Massive.com/Yahoo APIs.
+    Returns (current_price, options_df, message, yahoo_used: bool)
     """
     yahoo_used = False
 
@@ -602,16 +615,9 @@ def fetch_data_with_fallback_local(symbol, config):
             yahoo_used = True
 
     if options.empty:
-        return None, f"No options data for {symbol}", yahoo_used
+        return current_price, options, f"No options data for {symbol}", yahoo_used
 
-    options = calculate_metrics(options, current_price)
-    filtered = screen_options(options, config)
-    formatted = format_output(filtered, current_price)
-
-    if not formatted.empty:
-        return formatted, f"Found {len(formatted)} options for {symbol}", yahoo_used
-    else:
-        return None, f"No qualifying options for {symbol}", yahoo_used
+    return current_price, options, f"Fetched {len(options)} options for {symbol}", yahoo_used
 
 
 def fetch_data_via_api(symbols, config):
@@ -630,20 +636,16 @@ def fetch_data_via_api(symbols, config):
             "max_assignment_probability": config['screening_criteria']['max_assignment_probability']
         }
         
+        # Prefer a columnar format (Arrow / MessagePack / JSON arrays) over row objects
         resp = requests.post(
             f"{API_URL}/api/v1/screen",
             json=payload,
-            headers=get_auth_headers(),
+            headers={**get_auth_headers(), "Accept": accept_header(), "Accept-Encoding": ACCEPT_ENCODING},
             timeout=60
         )
         
         if resp.status_code == 200:
-            data = resp.json()
-            # Convert results back to DataFrames
-            results = {}
-            for symbol, options_list in data.get("results", {}).items():
-                if options_list:
-                    results[symbol] = pd.DataFrame(options_list)
+            results, data = decode_screen_response(resp.content, resp.headers.get("Content-Type"))
             return results, data.get("used_yahoo_fallback", False), data.get("screens_remaining"), None
         
         elif resp.status_code == 401:
@@ -662,53 +664,213 @@ def fetch_data_via_api(symbols, config):
         return {}, False, None, f"Error: {str(e)}"
 
 
-def run_screening(symbols):
-    """Run screening for given symbols"""
-    st.session_state.processing = True
-    st.session_state.stop_processing = False
-    st.session_state.results = {}
-    st.session_state.used_yahoo = False
+def stream_data_via_api(symbols, config, on_symbol=None):
+    """
+    SaaS mode: Screen options via the streaming endpoint, calling
+    on_symbol(symbol, results_df, completed, total) as each symbol finishes.
+    Falls back to fetch_data_via_api if the backend has no streaming endpoint.
+    Returns (results_dict, yahoo_used, screens_remaining, error_message)
+    """
+    try:
+        payload = {
+            "symbols": symbols,
+            "max_dte": config['options_strategy']['max_dte'],
+            "min_dte": config['options_strategy']['min_dte'],
+            "min_volume": config['options_strategy']['min_volume'],
+            "min_open_interest": config['options_strategy']['min_open_interest'],
+            "min_annualized_return": config['screening_criteria']['min_annualized_return'],
+            "max_assignment_probability": config['screening_criteria']['max_assignment_probability']
+        }
+        
+        # Read timeout applies between lines, not to the whole screen.
+        # Symbol events arrive as column arrays when the backend supports it.
+        with requests.post(
+            f"{API_URL}/api/v1/screen/stream",
+            json=payload,
+            headers={**get_auth_headers(), "Accept": stream_accept_header(), "Accept-Encoding": ACCEPT_ENCODING},
+            stream=True,
+            timeout=60
+        ) as resp:
+            if resp.status_code in (404, 405):
+                return fetch_data_via_api(symbols, config)
+            elif resp.status_code == 401:
+                st.session_state.auth_token = None
+                return {}, False, None, "Session expired. Please sign in again."
+            elif resp.status_code == 429:
+                return {}, False, 0, "Daily limit reached. Upgrade to Pro for unlimited screens."
+            elif resp.status_code != 200:
+                return {}, False, None, f"API error: {resp.status_code}"
+            
+            received = {}
+            for line in resp.iter_lines():
+                if not line:
+                    continue
+                event = decode_stream_event(line)
+                
+                if event.get("type") == "symbol":
+                    if not event["results"].empty:
+                        received[event["symbol"]] = event["results"]
+                    if on_symbol:
+                        on_symbol(event["symbol"], event["results"], event["completed"], event["total"])
+                    if st.session_state.stop_processing:
+                        break
+                
+                elif event.get("type") == "summary":
+                    # Keep watchlist order regardless of completion order
+                    results = {symbol: received[symbol] for symbol in symbols if symbol in received}
+                    return results, event.get("used_yahoo_fallback", False), event.get("screens_remaining"), None
+            
+            # Stopped early or the stream ended without a summary
+            results = {symbol: received[symbol] for symbol in symbols if symbol in received}
+            error = None if st.session_state.stop_processing else "Screening ended early. Showing partial results."
+            return results, False, None, error
+            
+    except requests.exceptions.Timeout:
+        return {}, False, None, "Request timed out. Please try again."
+    except Exception as e:
+        return {}, False, None, f"Error: {str(e)}"
 
-    live_config = get_live_config()
 
-    if SAAS_MODE:
-        # SaaS mode: single API call for all symbols
-        with st.spinner(f"Screening {len(symbols)} symbols..."):
-            results, yahoo_used, remaining, error = fetch_data_via_api(symbols, live_config)
-            
-            if error:
-                st.error(error)
-            else:
-                st.session_state.results = results
-                st.session_state.used_yahoo = yahoo_used
-                st.session_state.screens_remaining = remaining
-    else:
-        # Local mode: process symbols one by one
-        progress_bar = st.progress(0)
-        status_text = st.empty()
+def fetch_local_universe(symbols, missing, cached_universe, cached_yahoo, config):
+    """
+    Local mode: Fetch the missing symbols concurrently and add them to the
+    session universe. Cached symbols are screened up front; each fetched
+    symbol is screened as soon as its chain arrives, so results, progress and
+    a top-pick preview update while the remaining fetches run.
+    """
+    min_dte = config['options_strategy']['min_dte']
+    max_dte = config['options_strategy']['max_dte']
+    universe_cache = st.session_state.universe
+
+    # Fetch over the cached DTE window so new symbols can join the cached ones
+    fetch_min, fetch_max = universe_cache.fetch_window(min_dte, max_dte)
+    fetch_config = {**config, 'options_strategy': {**config['options_strategy'],
+                                                   'min_dte': fetch_min, 'max_dte': fetch_max}}
+
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+    preview = st.empty()
+    top_picks = []
+
+    def show(screened):
+        for symbol, results in screened.items():
+            st.session_state.results[symbol] = results
+            top_picks.append(results.iloc[0])
+        if top_picks:
+            preview.dataframe(pd.DataFrame(top_picks), hide_index=True)
+
+    st.session_state.used_yahoo = cached_yahoo
+    show(screen_universe(cached_universe, config))
+
+    prepared = {}
+    fetched, failed, yahoo_symbols = set(), set(), set()
+    total = len(missing)
+    # One bulk quote request for the missing symbols; per-symbol fetches read its cache
+    status_text.info(f"Fetching prices for {total} symbols...")
+    get_spot_prices(missing)
+    executor = ThreadPoolExecutor(max_workers=max(1, min(LOCAL_SCREEN_WORKERS, total)))
+    try:
+        futures = {
+            executor.submit(fetch_chain_with_fallback_local, symbol, fetch_config): symbol
+            for symbol in missing
+        }
 
-        total = len(symbols)
-        for i, symbol in enumerate(symbols):
+        for i, future in enumerate(as_completed(futures)):
             if st.session_state.stop_processing:
                 status_text.warning("Screening stopped")
                 break
-                
-            status_text.info(f"Processing {symbol}... ({i+1}/{total})")
-            progress_bar.progress((i + 1) / total)
 
+            symbol = futures[future]
             try:
-                result, message, yahoo_used = fetch_data_with_fallback_local(symbol, live_config)
+                current_price, options, message, yahoo_used = future.result()
+                fetched.add(symbol)
             except Exception as e:
-                result, message, yahoo_used = None, f"Error: {symbol} - {str(e)}", False
+                current_price, options, message, yahoo_used = None, None, f"Error: {symbol} - {str(e)}", False
+                failed.add(symbol)
 
             if yahoo_used:
+                yahoo_symbols.add(symbol)
                 st.session_state.used_yahoo = True
 
-            if result is not None and not result.empty:
-                st.session_state.results[symbol] = result
+            if options is not None and not options.empty:
+                universe = prepare_universe({symbol: options}, {symbol: current_price})
+                if not universe.empty:
+                    prepared[symbol] = universe
+                    show(screen_universe(universe[universe['dte'].between(min_dte, max_dte)], config))
+
+            status_text.info(f"{message} ({i+1}/{total})")
+            progress_bar.progress((i + 1) / total)
+    finally:
+        # Drop queued symbols (Stop button or rerun); running fetches finish in the background
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    # Completed fetches are kept even if stopped; symbols not reached stay missing
+    frames = [prepared[symbol] for symbol in symbols if symbol in prepared]
+    fresh = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    universe_cache.add(fresh, fetched, failed, yahoo_symbols, min_dte, max_dte)
+
+    # Results in watchlist order
+    results = st.session_state.results
+    st.session_state.results = {symbol: results[symbol] for symbol in symbols if symbol in results}
+
+    progress_bar.empty()
+    status_text.empty()
+    preview.empty()
+
+
+def run_screening(symbols):
+    """Run screening for given symbols"""
+    st.session_state.processing = True
+    st.session_state.stop_processing = False
+    st.session_state.results = {}
+    st.session_state.used_yahoo = False
+
+    live_config = get_live_config()
+
+    if SAAS_MODE:
+        # SaaS mode: stream results, showing each symbol's top pick as it arrives
+        progress_bar = st.progress(0)
+        status_text = st.empty()
+        preview = st.empty()
+        status_text.info(f"Screening {len(symbols)} symbols...")
+        top_picks = []
+
+        def on_symbol(symbol, results, completed, total):
+            found = f"{len(results)} options" if not results.empty else "no matches"
+            status_text.info(f"{symbol}: {found} ({completed}/{total})")
+            progress_bar.progress(completed / total)
+            if not results.empty:
+                top_picks.append(results.iloc[0])
+                preview.dataframe(pd.DataFrame(top_picks), hide_index=True)
+
+        results, yahoo_used, remaining, error = stream_data_via_api(symbols, live_config, on_symbol)
+
+        if error:
+            st.error(error)
+        if results or not error:
+            # Partial results are kept when the stream is stopped or cut off
+            st.session_state.results = results
+            st.session_state.used_yahoo = yahoo_used
+        if not error and not st.session_state.stop_processing:
+            st.session_state.screens_remaining = remaining
 
         progress_bar.empty()
         status_text.empty()
+        preview.empty()
+    else:
+        # Local mode: re-screen what the session already fetched, fetch only the rest
+        min_dte = live_config['options_strategy']['min_dte']
+        max_dte = live_config['options_strategy']['max_dte']
+        universe_cache = st.session_state.universe
+        cached_universe, missing, cached_yahoo, age = universe_cache.lookup(symbols, min_dte, max_dte)
+
+        if not missing:
+            with st.spinner(f"Re-screening data fetched {age / 60:.0f} min ago..."):
+                screened = screen_universe(cached_universe, live_config)
+            st.session_state.results = {symbol: screened[symbol] for symbol in symbols if symbol in screened}
+            st.session_state.used_yahoo = cached_yahoo
+        else:
+            fetch_local_universe(symbols, missing, cached_universe, cached_yahoo, live_config)
 
     # Create summary if multiple results
     if len(st.session_state.results) > 1:
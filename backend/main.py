@@ -10,14 +10,20 @@ Provides REST API for the options screener with:
 
 import os
 import sys
+import asyncio
 import hashlib
 import secrets
-from datetime import datetime, date, timedelta
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, date, time as dt_time, timedelta
 from typing import Optional, List
 from contextlib import asynccontextmanager
+from zoneinfo import ZoneInfo
 
 from fastapi import FastAPI, HTTPException, Depends, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
 import jwt
 import stripe
@@ -27,12 +33,21 @@ from dotenv import load_dotenv
 # Add parent directory to path to import screener modules
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from screen_result_cache import screen_result_cache
+from wire_format import ORJSON_AVAILABLE, dumps_json, frame_rows, negotiate_stream, stream_results
+
 from sqlalchemy import create_engine, Column, String, Integer, Float, Date, DateTime, Text, ForeignKey
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session, relationship
 import uuid
 import json
 
+try:
+    from brotli_asgi import BrotliMiddleware
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
 # Load environment variables
 load_dotenv()
 
@@ -70,6 +85,25 @@ FREE_SCREENS_PER_DAY = 5
 FREE_MAX_SYMBOLS = 5
 PRO_MAX_SYMBOLS = 50
 
+# Screening engine limits
+SCREEN_SYMBOL_TIMEOUT = float(os.getenv("SCREEN_SYMBOL_TIMEOUT", "30"))  # Seconds per symbol
+FREE_SCREEN_CONCURRENCY = int(os.getenv("FREE_SCREEN_CONCURRENCY", "4"))  # Symbols in flight, all free users
+PRO_SCREEN_CONCURRENCY = int(os.getenv("PRO_SCREEN_CONCURRENCY", "12"))  # Symbols in flight, all pro users
+# Symbol fetch pool size; default FREE + PRO so every tier slot has a thread
+SCREEN_WORKERS = int(os.getenv("SCREEN_WORKERS", str(FREE_SCREEN_CONCURRENCY + PRO_SCREEN_CONCURRENCY)))
+
+# Background pre-warming of popular chains (see Pre-warm Scheduler)
+PREWARM_ENABLED = os.getenv("PREWARM_ENABLED", "true").lower() in ("1", "true", "yes")
+PREWARM_INTERVAL = float(os.getenv("PREWARM_INTERVAL", "900"))  # Seconds, matches the 15-min data delay
+PREWARM_MAX_SYMBOLS = int(os.getenv("PREWARM_MAX_SYMBOLS", "50"))  # Most-watched symbols kept warm
+PREWARM_CONCURRENCY = int(os.getenv("PREWARM_CONCURRENCY", "4"))  # Chains fetched at once while warming
+
+# Response compression (gzip, plus Brotli when brotli-asgi is installed)
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() in ("1", "true", "yes")
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1000"))  # Bytes; smaller bodies sent as-is
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))  # 1 (fastest) - 9 (smallest)
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "4"))  # 0 (fastest) - 11 (smallest)
+
 # =============================================================================
 # Database Setup
 # =============================================================================
@@ -260,6 +294,22 @@ class AuthResponse(BaseModel):
     subscription_status: str
 
 
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson (see backend/requirements.txt).
+    NumPy/pandas values are encoded directly, so handlers can return screener
+    output without converting it to Python objects first.
+    """
+    
+    def render(self, content) -> bytes:
+        return dumps_json(content)
+
+
+if not ORJSON_AVAILABLE:
+    print("WARNING: orjson is not installed. Responses use the slower stdlib JSON encoder "
+          "(pip install -r backend/requirements.txt).")
+
+
 # JWT Secret for our own tokens (fallback when Clerk not used)
 JWT_SECRET = os.getenv("JWT_SECRET", secrets.token_hex(32))
 
@@ -510,15 +560,367 @@ def check_and_increment_usage(db: Session, user: User) -> int:
     return remaining
 
 
+# =============================================================================
+# Screening Engine
+# =============================================================================
+
+# The screener and data clients are blocking, so work runs on thread pools.
+# This keeps the event loop (and /health) responsive while long screens run.
+# - _screen_executor runs symbol fetches only, each under a tier cap. Caps count
+#   running threads (see run_capped), so with SCREEN_WORKERS >= FREE + PRO
+#   concurrency (the default) hung free-tier fetches cannot occupy threads
+#   that Pro screens need.
+# - Uncapped work has its own pools so it never queues ahead of those fetches:
+#   ranking fetched chains (short, CPU-bound) on _compute_executor, and spot
+#   price warm-up plus the pre-warm scheduler on _warm_executor (pre-warm
+#   chain fetches are capped by PREWARM_CONCURRENCY, leaving 2 threads spare).
+_screen_executor = ThreadPoolExecutor(max_workers=SCREEN_WORKERS, thread_name_prefix="screen")
+_compute_executor = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1), thread_name_prefix="rank")
+_warm_executor = ThreadPoolExecutor(max_workers=PREWARM_CONCURRENCY + 2, thread_name_prefix="warm")
+if SCREEN_WORKERS < FREE_SCREEN_CONCURRENCY + PRO_SCREEN_CONCURRENCY:
+    print(f"WARNING: SCREEN_WORKERS ({SCREEN_WORKERS}) is below FREE + PRO screen concurrency; "
+          "Pro screens may wait for free-tier fetches.")
+_tier_semaphores = {}
+
+
+def get_tier_semaphore(tier: str) -> asyncio.Semaphore:
+    """Get the global concurrency cap shared by all users of a tier"""
+    if tier not in _tier_semaphores:
+        limit = PRO_SCREEN_CONCURRENCY if tier == "pro" else FREE_SCREEN_CONCURRENCY
+        _tier_semaphores[tier] = asyncio.Semaphore(limit)
+    return _tier_semaphores[tier]
+
+
+def prefetch_spot_prices(symbols: List[str]):
+    """Warm the shared spot price cache for a whole watchlist (blocking)"""
+    from price_service import get_spot_prices
+    return get_spot_prices(symbols)
+
+
+def fetch_symbol(symbol: str, config: dict):
+    """
+    Fetch price and options chain for a single symbol (blocking - runs on the worker pool).
+    Returns (current_price, options DataFrame or None, used_yahoo)
+    """
+    from options_screener import (
+        get_options_chain_massive,
+        get_options_chain_yahoo,
+        get_stock_price_massive,
+        get_stock_price_yahoo
+    )
+    
+    used_yahoo = False
+    
+    # Get price (Massive first, Yahoo fallback)
+    current_price = get_stock_price_massive(symbol)
+    if current_price is None:
+        current_price = get_stock_price_yahoo(symbol)
+        used_yahoo = True
+    
+    if current_price is None:
+        return None, None, used_yahoo
+    
+    # Get options chain (Massive first, Yahoo fallback)
+    options = get_options_chain_massive(symbol, config)
+    if options.empty:
+        options = get_options_chain_yahoo(symbol, config)
+        if not options.empty:
+            used_yahoo = True
+    
+    if options.empty:
+        return current_price, None, used_yahoo
+    
+    return current_price, options, used_yahoo
+
+
+def screen_fetched(chains: dict, prices: dict, config: dict) -> dict:
+    """
+    Screen all fetched chains in one batch (blocking - runs on the compute pool).
+    Returns dict of symbol -> formatted DataFrame (encoded per response format)
+    """
+    from options_screener import run_screening_pipeline
+    
+    return run_screening_pipeline(chains, prices, config)
+
+
+def records(results: dict) -> dict:
+    """Symbol -> list of row dicts, the default JSON response shape"""
+    return {symbol: frame_rows(formatted) for symbol, formatted in results.items()}
+
+
+async def run_capped(semaphore: asyncio.Semaphore, fn, *args, timeout: Optional[float] = None,
+                     executor: Optional[ThreadPoolExecutor] = None):
+    """
+    Run fn on a worker pool (default: the symbol fetch pool) while holding
+    one slot of semaphore.
+    
+    A worker thread cannot be interrupted, so on timeout the caller stops
+    waiting but the slot stays taken until the thread actually finishes.
+    The cap therefore bounds real pool usage even when upstreams hang.
+    Raises asyncio.TimeoutError after timeout (default SCREEN_SYMBOL_TIMEOUT) seconds.
+    """
+    loop = asyncio.get_running_loop()
+    timeout = SCREEN_SYMBOL_TIMEOUT if timeout is None else timeout
+    await semaphore.acquire()
+    try:
+        future = loop.run_in_executor(executor or _screen_executor, fn, *args)
+    except BaseException:
+        semaphore.release()
+        raise
+    
+    def release(done):
+        semaphore.release()
+        if not done.cancelled():
+            done.exception()  # Retrieved here in case the caller timed out
+    
+    future.add_done_callback(release)
+    # Shielded so a timeout or cancelled request does not mark the future done early
+    return await asyncio.wait_for(asyncio.shield(future), timeout=timeout)
+
+
+async def fetch_symbol_bounded(symbol: str, config: dict, semaphore: asyncio.Semaphore):
+    """
+    Run fetch_symbol on the worker pool under the tier's concurrency cap and
+    SCREEN_SYMBOL_TIMEOUT. Failures are logged and returned as (None, None, False).
+    """
+    try:
+        return await run_capped(semaphore, fetch_symbol, symbol, config)
+    except asyncio.TimeoutError:
+        # The worker thread finishes in the background and keeps its slot until then
+        print(f"Timed out processing {symbol} after {SCREEN_SYMBOL_TIMEOUT:.0f}s")
+    except Exception as e:
+        print(f"Error processing {symbol}: {e}")
+    return None, None, False
+
+
+async def warm_spot_prices(symbols: List[str]):
+    """One bulk quote request for the watchlist; per-symbol fetches read its cache"""
+    loop = asyncio.get_running_loop()
+    try:
+        await loop.run_in_executor(_warm_executor, prefetch_spot_prices, symbols)
+    except Exception as e:
+        print(f"Batch price fetch failed, falling back to per-symbol prices: {e}")
+
+
+async def run_screen_engine(symbols: List[str], config: dict, tier: str = "free"):
+    """
+    Fetch symbols concurrently on the worker pool, then screen them in one batch.
+    Each fetch is bounded by SCREEN_SYMBOL_TIMEOUT and the tier's concurrency cap.
+    Returns (results dict in request order, used_yahoo)
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = get_tier_semaphore(tier)
+    
+    await warm_spot_prices(symbols)
+    
+    outcomes = await asyncio.gather(
+        *(fetch_symbol_bounded(symbol, config, semaphore) for symbol in symbols)
+    )
+    
+    chains = {}
+    prices = {}
+    used_yahoo = False
+    for symbol, (current_price, options, yahoo) in zip(symbols, outcomes):
+        used_yahoo = used_yahoo or yahoo
+        if options is not None:
+            chains[symbol] = options
+            prices[symbol] = current_price
+    
+    if not chains:
+        return {}, used_yahoo
+    
+    results = await loop.run_in_executor(_compute_executor, screen_fetched, chains, prices, config)
+    return results, used_yahoo
+
+
+async def stream_screen_engine(symbols: List[str], config: dict, tier: str = "free"):
+    """
+    Streaming variant of run_screen_engine: screens each symbol as soon as its
+    fetch completes instead of waiting for the slowest one. Results are ranked
+    per symbol, so they match the batch engine.
+    Yields (symbol, formatted DataFrame or None, used_yahoo) in completion order.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = get_tier_semaphore(tier)
+    
+    await warm_spot_prices(symbols)
+    
+    async def fetch_one(symbol):
+        return symbol, await fetch_symbol_bounded(symbol, config, semaphore)
+    
+    tasks = [asyncio.create_task(fetch_one(symbol)) for symbol in symbols]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            symbol, (current_price, options, used_yahoo) = await next_done
+            results = None
+            if options is not None:
+                try:
+                    screened = await loop.run_in_executor(
+                        _compute_executor, screen_fetched,
+                        {symbol: options}, {symbol: current_price}, config
+                    )
+                    results = screened.get(symbol)
+                except Exception as e:
+                    print(f"Error screening {symbol}: {e}")
+            yield symbol, results, used_yahoo
+    finally:
+        # Client went away mid-stream: drop fetches that have not started yet
+        for task in tasks:
+            task.cancel()
+
+
+# =============================================================================
+# Pre-warm Scheduler
+# =============================================================================
+
+# Refreshes the most-watched chains and spot prices on a fixed cadence so that
+# screens (especially the first one of the day) read from memory. Runs only
+# during US market hours; the close is extended by the data delay so the last
+# delayed quotes are picked up. Exchange holidays are not tracked.
+MARKET_TZ = ZoneInfo("America/New_York")
+MARKET_OPEN = dt_time(9, 30)
+MARKET_CLOSE = dt_time(16, 15)
+
+_prewarm_stats = {
+    "runs": 0,
+    "last_run": None,
+    "last_duration_seconds": None,
+    "last_symbols": 0,
+    "last_failed": 0,
+    "next_run": None,
+}
+
+
+def is_market_hours(now: Optional[datetime] = None) -> bool:
+    """True on weekdays from MARKET_OPEN through MARKET_CLOSE (US/Eastern)"""
+    now = (now or datetime.now(MARKET_TZ)).astimezone(MARKET_TZ)
+    return now.weekday() < 5 and MARKET_OPEN <= now.time() <= MARKET_CLOSE
+
+
+def next_prewarm_time(now: Optional[datetime] = None) -> datetime:
+    """
+    Next pre-warm run: the next PREWARM_INTERVAL boundary (:00/:15/:30/:45 by
+    default) if it falls in market hours, otherwise the next market open.
+    """
+    now = (now or datetime.now(MARKET_TZ)).astimezone(MARKET_TZ)
+    boundary = (now.timestamp() // PREWARM_INTERVAL + 1) * PREWARM_INTERVAL
+    candidate = datetime.fromtimestamp(boundary, MARKET_TZ)
+    if is_market_hours(candidate):
+        return candidate
+    
+    day = now.date()
+    if now.weekday() >= 5 or now.time() >= MARKET_OPEN:
+        day += timedelta(days=1)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    return datetime.combine(day, MARKET_OPEN, tzinfo=MARKET_TZ)
+
+
+def popular_symbols(limit: int) -> List[str]:
+    """Union of all users' watchlists, most-watched first (blocking DB query)"""
+    counts = Counter()
+    if SessionLocal is not None:
+        db = SessionLocal()
+        try:
+            for (symbols,) in db.query(UserSettings.symbols).all():
+                counts.update({sym.strip().upper() for sym in (symbols or "").split(",") if sym.strip()})
+        finally:
+            db.close()
+    
+    if not counts:
+        counts.update(UserSettingsModel().symbols)
+    return [symbol for symbol, _ in counts.most_common(limit)]
+
+
+def warm_chain(symbol: str) -> bool:
+    """Re-fetch a symbol's shared chain window into the cache (blocking)"""
+    from chain_cache import CHAIN_WINDOW_MIN_DTE, CHAIN_WINDOW_MAX_DTE
+    from massive_api_client import massive_client
+    
+    if not massive_client:
+        return False
+    
+    config = {'options_strategy': {'min_dte': CHAIN_WINDOW_MIN_DTE, 'max_dte': CHAIN_WINDOW_MAX_DTE}}
+    return not massive_client.get_options_chain(symbol, config, use_cache=False).empty
+
+
+async def run_prewarm():
+    """Refresh spot prices and chains for the most popular symbols"""
+    loop = asyncio.get_running_loop()
+    started = datetime.utcnow()
+    
+    symbols = await loop.run_in_executor(_warm_executor, popular_symbols, PREWARM_MAX_SYMBOLS)
+    await loop.run_in_executor(_warm_executor, prefetch_spot_prices, symbols)
+    
+    semaphore = asyncio.Semaphore(PREWARM_CONCURRENCY)
+    
+    async def warm(symbol):
+        try:
+            return await run_capped(semaphore, warm_chain, symbol, executor=_warm_executor)
+        except Exception as e:
+            print(f"Pre-warm failed for {symbol}: {e}")
+            return False
+    
+    results = await asyncio.gather(*(warm(symbol) for symbol in symbols))
+    
+    duration = (datetime.utcnow() - started).total_seconds()
+    failed = results.count(False)
+    _prewarm_stats.update({
+        "runs": _prewarm_stats["runs"] + 1,
+        "last_run": started.isoformat(),
+        "last_duration_seconds": round(duration, 2),
+        "last_symbols": len(symbols),
+        "last_failed": failed,
+    })
+    print(f"Pre-warmed {len(symbols) - failed}/{len(symbols)} chains in {duration:.1f}s")
+
+
+async def prewarm_loop():
+    """Run pre-warming now (if the market is open) and then on every cadence boundary"""
+    run_now = is_market_hours()
+    while True:
+        if run_now:
+            try:
+                await run_prewarm()
+            except Exception as e:
+                print(f"Pre-warm run failed: {e}")
+        
+        next_run = next_prewarm_time()
+        _prewarm_stats["next_run"] = next_run.isoformat()
+        await asyncio.sleep(max(0.0, (next_run - datetime.now(MARKET_TZ)).total_seconds()))
+        run_now = is_market_hours()
+
+
 # =============================================================================
 # FastAPI App
 # =============================================================================
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Initialize resources on startup"""
+    """Initialize resources on startup, stop background tasks on shutdown"""
     init_db()
+    
+    prewarm_task = None
+    prewarm_leader = None
+    if PREWARM_ENABLED and MASSIVE_API_KEY:
+        # With a shared chain cache, one worker warms it for all of them
+        from shared_chain_cache import shared_cache_enabled, try_acquire_leader
+        prewarm_leader = try_acquire_leader("prewarm") if shared_cache_enabled() else True
+        if prewarm_leader:
+            prewarm_task = asyncio.create_task(prewarm_loop())
+        else:
+            print("Pre-warm scheduler running in another worker")
+    
     yield
+    
+    if prewarm_task:
+        prewarm_task.cancel()
+        try:
+            await prewarm_task
+        except asyncio.CancelledError:
+            pass
+    if prewarm_leader not in (None, True):
+        prewarm_leader.close()
 
 
 app = FastAPI(
@@ -537,6 +939,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compression: Brotli for clients that accept it, gzip otherwise. GZip is added
+# last so it is outermost and leaves Brotli-encoded bodies alone. Streamed
+# chunks (NDJSON) are flushed as they are written, so progress still arrives
+# incrementally.
+if COMPRESSION_ENABLED:
+    if BROTLI_AVAILABLE:
+        app.add_middleware(BrotliMiddleware, quality=BROTLI_QUALITY,
+                           minimum_size=COMPRESSION_MIN_SIZE, gzip_fallback=False)
+    app.add_middleware(GZipMiddleware, minimum_size=COMPRESSION_MIN_SIZE, compresslevel=GZIP_LEVEL)
+
 
 # =============================================================================
 # API Endpoints
@@ -553,6 +965,24 @@ async def health_check():
     }
 
 
+@app.get("/api/v1/stats")
+async def get_stats():
+    """Cache statistics (hit/miss counters, memory usage, coalesced requests)"""
+    try:
+        from massive_api_client import massive_client
+        from price_service import price_service
+    except ImportError as e:
+        return {"error": f"Screener module error: {e}"}
+    
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "chain_cache": massive_client.cache_stats() if massive_client else None,
+        "spot_prices": price_service.stats(),
+        "screen_results": screen_result_cache.stats(),
+        "prewarm": _prewarm_stats
+    }
+
+
 # =============================================================================
 # Simple Email/Password Authentication Endpoints
 # =============================================================================
@@ -636,7 +1066,7 @@ async def login(auth_req: AuthRequest, db: Session = Depends(get_db)):
     )
 
 
-@app.get("/api/v1/test-screen")
+@app.get("/api/v1/test-screen", response_class=FastJSONResponse)
 async def test_screen(symbol: str = "AAPL"):
     """
     Test endpoint - no auth required.
@@ -686,17 +1116,17 @@ async def test_screen(symbol: str = "AAPL"):
     filtered = filter_options(options, config)
     formatted = format_output(filtered, current_price)
     
-    return {
+    return FastJSONResponse({
         "symbol": symbol,
         "current_price": current_price,
         "price_source": price_source,
         "options_source": options_source,
         "results_count": len(formatted),
-        "top_results": formatted.head(5).to_dict(orient='records') if not formatted.empty else []
-    }
+        "top_results": frame_rows(formatted.head(5))
+    })
 
 
-@app.get("/api/v1/news/{symbol}")
+@app.get("/api/v1/news/{symbol}", response_class=FastJSONResponse)
 async def get_ticker_news(symbol: str, limit: int = 10, max_age_days: int = 7):
     """Get recent news for a ticker symbol"""
     try:
@@ -705,7 +1135,7 @@ async def get_ticker_news(symbol: str, limit: int = 10, max_age_days: int = 7):
             return {"news": [], "error": "Massive client not available"}
         
         news_items = massive_client.get_ticker_news(symbol, limit=limit, max_age_days=max_age_days)
-        return {"symbol": symbol, "news": news_items}
+        return FastJSONResponse({"symbol": symbol, "news": news_items})
     except Exception as e:
         return {"news": [], "error": str(e)}
 
@@ -781,19 +1211,11 @@ async def update_settings(
     return get_user_settings_model(user)
 
 
-@app.post("/api/v1/screen", response_model=ScreenResponse)
-async def screen_options(
-    request: ScreenRequest,
-    user_info: dict = Depends(verify_clerk_token),
-    db: Session = Depends(get_db)
-):
+def authorize_screen(db: Session, user: User, request: ScreenRequest) -> int:
     """
-    Screen options based on criteria.
-    Enforces usage limits for free tier users.
+    Enforce the tier's symbol limit and count the screen against usage.
+    Returns screens remaining today (-1 for unlimited).
     """
-    user = get_or_create_user(db, user_info["sub"], user_info.get("email"))
-    
-    # Check symbol limits
     max_symbols = PRO_MAX_SYMBOLS if user.subscription_status == "pro" else FREE_MAX_SYMBOLS
     if len(request.symbols) > max_symbols:
         raise HTTPException(
@@ -801,25 +1223,18 @@ async def screen_options(
             detail=f"Maximum {max_symbols} symbols allowed. Upgrade to Pro for more."
         )
     
-    # Check and increment usage
-    screens_remaining = check_and_increment_usage(db, user)
-    
-    # Import screener logic
+    # Import screener logic before counting the screen
     try:
-        from options_screener import (
-            get_options_chain_massive,
-            get_options_chain_yahoo,
-            get_stock_price_massive,
-            get_stock_price_yahoo,
-            calculate_metrics,
-            screen_options as filter_options,
-            format_output
-        )
+        import options_screener
     except ImportError as e:
         raise HTTPException(status_code=500, detail=f"Screener module error: {e}")
     
-    # Build config for screener
-    config = {
+    return check_and_increment_usage(db, user)
+
+
+def build_screen_config(request: ScreenRequest) -> dict:
+    """Build the screener config for a screen request"""
+    return {
         'options_strategy': {
             'max_dte': request.max_dte,
             'min_dte': request.min_dte,
@@ -836,50 +1251,151 @@ async def screen_options(
             'max_results': 50
         }
     }
+
+
+def ndjson_line(event: dict) -> bytes:
+    """Encode one streaming event as a line of JSON"""
+    return dumps_json(event) + b"\n"
+
+
+@app.post("/api/v1/screen", response_model=ScreenResponse, response_class=FastJSONResponse)
+async def screen_options(
+    request: ScreenRequest,
+    user_info: dict = Depends(verify_clerk_token),
+    db: Session = Depends(get_db),
+    accept: Optional[str] = Header(None)
+):
+    """
+    Screen options based on criteria.
+    Enforces usage limits for free tier users.
     
-    results = {}
-    used_yahoo = False
+    Results are row objects per symbol by default; clients can request a
+    columnar form via Accept (see wire_format.py).
+    """
+    from wire_format import JSON, encode_screen_response, negotiate
+    
+    user = get_or_create_user(db, user_info["sub"], user_info.get("email"))
+    screens_remaining = authorize_screen(db, user, request)
+    config = build_screen_config(request)
+    
+    results, used_yahoo = await screen_result_cache.get_or_compute(
+        request, lambda: run_screen_engine(request.symbols, config, tier=user.subscription_status)
+    )
     
-    for symbol in request.symbols:
+    meta = {
+        "success": True,
+        "screens_remaining": screens_remaining if screens_remaining >= 0 else None,
+        "used_yahoo_fallback": used_yahoo,
+        "message": f"Screened {len(results)} symbols successfully"
+    }
+    
+    media_type = negotiate(accept)
+    if media_type != JSON:
+        return Response(
+            content=encode_screen_response(results, meta, media_type),
+            media_type=media_type,
+            headers={"Vary": "Accept"}
+        )
+    
+    # Returned as a response (not a model) so rows are not validated and re-encoded
+    return FastJSONResponse({**meta, "results": records(results)})
+
+
+@app.post("/api/v1/screen/stream")
+async def screen_options_stream(
+    request: ScreenRequest,
+    user_info: dict = Depends(verify_clerk_token),
+    db: Session = Depends(get_db),
+    accept: Optional[str] = Header(None)
+):
+    """
+    Streaming variant of /api/v1/screen (NDJSON, one JSON object per line).
+    Emits a "symbol" event as each symbol finishes, then a final "summary"
+    event. Limits and usage accounting are the same as /api/v1/screen and
+    are applied before the stream starts.
+    
+    Symbol events carry row objects, or column arrays when the client
+    accepts columnar NDJSON (see wire_format.py).
+    """
+    user = get_or_create_user(db, user_info["sub"], user_info.get("email"))
+    screens_remaining = authorize_screen(db, user, request)
+    config = build_screen_config(request)
+    tier = user.subscription_status
+    media_type = negotiate_stream(accept)
+    
+    cache_key = screen_result_cache.key(request)
+    cached = screen_result_cache.get(cache_key)
+    joined = screen_result_cache.join(cache_key) if cached is None else None
+    
+    async def replay(results, used_yahoo):
+        """Cached results as engine output, in request order"""
+        for symbol in request.symbols:
+            yield symbol, results.get(symbol), used_yahoo
+    
+    async def events():
+        entry = cached
+        if joined is not None:
+            try:
+                # The same screen is already running (/screen or another stream): replay its result
+                entry = await asyncio.shield(joined)
+            except asyncio.CancelledError:
+                if not joined.cancelled():
+                    raise
+            except Exception as e:
+                # The joined /screen failed: run this stream's own screen instead of
+                # breaking off the response
+                print(f"WARNING: Joined screen failed, streaming independently: {str(e)}")
+
+        # Otherwise register this stream so identical requests join it
+        pending = None
+        if entry is not None:
+            source = replay(*entry)
+        else:
+            pending = screen_result_cache.begin(cache_key)
+            source = stream_screen_engine(request.symbols, config, tier=tier)
+        
+        total = len(request.symbols)
+        completed = 0
+        with_results = 0
+        used_yahoo = False
+        collected = {}
         try:
-            # Get price (Massive first, Yahoo fallback)
-            current_price = get_stock_price_massive(symbol)
-            if current_price is None:
-                current_price = get_stock_price_yahoo(symbol)
-                used_yahoo = True
-            
-            if current_price is None:
-                continue
-            
-            # Get options chain (Massive first, Yahoo fallback)
-            options = get_options_chain_massive(symbol, config)
-            if options.empty:
-                options = get_options_chain_yahoo(symbol, config)
-                if not options.empty:
-                    used_yahoo = True
-            
-            if options.empty:
-                continue
-            
-            # Calculate metrics and filter
-            options = calculate_metrics(options, current_price)
-            filtered = filter_options(options, config)
-            formatted = format_output(filtered, current_price)
-            
-            if not formatted.empty:
-                # Convert DataFrame to list of dicts for JSON response
-                results[symbol] = formatted.to_dict(orient='records')
-                
-        except Exception as e:
-            print(f"Error processing {symbol}: {e}")
-            continue
-    
-    return ScreenResponse(
-        success=True,
-        results=results,
-        screens_remaining=screens_remaining if screens_remaining >= 0 else None,
-        used_yahoo_fallback=used_yahoo,
-        message=f"Screened {len(results)} symbols successfully"
+            async for symbol, results, yahoo in source:
+                completed += 1
+                used_yahoo = used_yahoo or yahoo
+                if results is not None:
+                    with_results += 1
+                    collected[symbol] = results
+                yield ndjson_line({
+                    "type": "symbol",
+                    "symbol": symbol,
+                    "results": stream_results(results, media_type),
+                    "used_yahoo_fallback": yahoo,
+                    "completed": completed,
+                    "total": total
+                })
+        finally:
+            # Resolving the future stores the results; an abandoned stream cancels it
+            if pending is not None and not pending.done():
+                if completed == total:
+                    pending.set_result((collected, used_yahoo))
+                else:
+                    pending.cancel()
+        
+        yield ndjson_line({
+            "type": "summary",
+            "success": True,
+            "symbols": with_results,
+            "screens_remaining": screens_remaining if screens_remaining >= 0 else None,
+            "used_yahoo_fallback": used_yahoo,
+            "message": f"Screened {with_results} symbols successfully"
+        })
+    
+    return StreamingResponse(
+        events(),
+        media_type=media_type,
+        # Stop reverse proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "Vary": "Accept"}
     )
 
 
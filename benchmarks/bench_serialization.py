@@ -0,0 +1,128 @@
+"""
+Benchmark - Screen response serialization
+- Portions generated by AI
+
+Times one /api/v1/screen response body for a 50-symbol x 50-row screen:
+- Before: to_dict(orient='records') -> ScreenResponse model -> FastAPI's
+  default JSONResponse (stdlib json)
+- After: frame_rows -> dumps_json (orjson with native NumPy values, or the
+  stdlib fallback when orjson is not installed)
+- The columnar formats from wire_format, for comparison
+
+Run with: python benchmarks/bench_serialization.py
+"""
+
+import os
+import sys
+import time
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import wire_format
+from wire_format import available_formats, dumps_json, encode_screen_response, frame_rows, JSON
+
+SYMBOLS = 50
+ROWS = 50
+
+
+class ScreenResponse(BaseModel):
+    """Same fields as backend/main.py ScreenResponse"""
+    success: bool
+    results: dict
+    screens_remaining: Optional[int] = None
+    used_yahoo_fallback: bool = False
+    message: str = ""
+
+
+def make_results(symbols=SYMBOLS, rows=ROWS, seed=0):
+    """Formatted screener output (format_output columns) per symbol"""
+    rng = np.random.default_rng(seed)
+    results = {}
+    for i in range(symbols):
+        price = rng.uniform(20, 500)
+        results[f"SYM{i:02d}"] = pd.DataFrame({
+            'symbol': f"SYM{i:02d}",
+            'current_price': price,
+            'strike': np.round(price * rng.uniform(0.8, 1.0, rows), 1),
+            'lastPrice': rng.uniform(0.05, 5, rows),
+            'annualized_return': np.round(rng.uniform(20, 80, rows), 2),
+            'daily_decay_contract': np.round(rng.uniform(0, 0.2, rows), 4),
+            'prob_assign': np.round(rng.uniform(0, 20, rows), 1),
+            'expiry': rng.choice(['2026-11-20', '2026-11-27', '2026-12-18'], rows),
+            'calendar_days': rng.integers(15, 45, rows),
+            'volume': rng.integers(10, 5000, rows),
+            'open_interest': rng.integers(10, 20000, rows),
+            'impliedVolatility': np.round(rng.uniform(10, 90, rows), 2),
+        })
+    return results
+
+
+META = {"success": True, "screens_remaining": None, "used_yahoo_fallback": False, "message": "ok"}
+
+
+def before(results):
+    """Previous path: records dicts, response model, stdlib JSONResponse"""
+    records = {symbol: df.to_dict(orient='records') for symbol, df in results.items()}
+    model = ScreenResponse(results=records, **META)
+    return JSONResponse(model.model_dump(mode='json')).body
+
+
+def after(results):
+    """Current path: NumPy row dicts rendered by dumps_json"""
+    return dumps_json({**META, "results": {symbol: frame_rows(df) for symbol, df in results.items()}})
+
+
+def best_time(fn, repeat=10):
+    """Best wall-clock time of several runs, and the last result"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    results = make_results()
+
+    print("=" * 70)
+    print(f"SCREEN RESPONSE SERIALIZATION ({SYMBOLS} symbols x {ROWS} rows)")
+    print("=" * 70)
+    print(f"{'Path':<44} {'Time (ms)':>10} {'Bytes':>12}")
+
+    baseline, body = best_time(lambda: before(results))
+    print(f"{'Before: to_dict + model + JSONResponse':<44} {baseline * 1000:>10.2f} {len(body):>12,}")
+
+    orjson_available = wire_format.ORJSON_AVAILABLE
+    try:
+        wire_format.ORJSON_AVAILABLE = False
+        elapsed, body = best_time(lambda: after(results))
+        print(f"{'After: frame_rows + stdlib json':<44} {elapsed * 1000:>10.2f} {len(body):>12,}")
+    finally:
+        wire_format.ORJSON_AVAILABLE = orjson_available
+
+    if orjson_available:
+        elapsed, body = best_time(lambda: after(results))
+        print(f"{'After: frame_rows + orjson':<44} {elapsed * 1000:>10.2f} {len(body):>12,}"
+              f"   ({baseline / elapsed:.1f}x faster)")
+    else:
+        print("After: frame_rows + orjson                   (orjson not installed)")
+
+    print()
+    print("COLUMNAR FORMATS (Accept negotiation)")
+    for media_type in available_formats():
+        if media_type == JSON:
+            continue
+        elapsed, body = best_time(lambda: encode_screen_response(results, META, media_type))
+        print(f"{media_type:<44} {elapsed * 1000:>10.2f} {len(body):>12,}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,265 @@
+"""
+Options Chain Cache - In-memory TTL cache for options chains
+- Portions generated by AI
+
+Massive.com options data is 15-minute delayed, so a chain fetched inside that
+window is as fresh as a new fetch.
+
+Each symbol/contract type is fetched once over a wide expiration window
+(at least CHAIN_WINDOW_MIN_DTE-CHAIN_WINDOW_MAX_DTE). Requests for any DTE
+range inside that window are answered by slicing the cached frame, so users
+with different min_dte/max_dte settings share one upstream fetch per symbol.
+Entries are evicted least-recently-used once the cache grows past its
+memory budget.
+
+SingleFlight merges identical fetches that are in flight at the same time:
+when several users miss the cache for the same chain at once, only the
+first one pages through the API and the others wait for its result.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import pandas as pd
+
+# Options data delay on the Massive.com plan
+DATA_DELAY_SECONDS = 15 * 60
+
+DEFAULT_TTL_SECONDS = float(os.getenv("CHAIN_CACHE_TTL", DATA_DELAY_SECONDS))
+DEFAULT_MAX_MB = float(os.getenv("CHAIN_CACHE_MAX_MB", "256"))
+
+# Expiration window fetched for every symbol, widened to cover larger requests
+CHAIN_WINDOW_MIN_DTE = int(os.getenv("CHAIN_WINDOW_MIN_DTE", "0"))
+CHAIN_WINDOW_MAX_DTE = int(os.getenv("CHAIN_WINDOW_MAX_DTE", "60"))
+
+
+def widen_window(min_dte: int, max_dte: int,
+                 cached_window: Optional[Tuple[int, int]] = None) -> Tuple[int, int]:
+    """Union of the requested range, the shared CHAIN_WINDOW and a fresh cached window"""
+    window_min, window_max = min(min_dte, CHAIN_WINDOW_MIN_DTE), max(max_dte, CHAIN_WINDOW_MAX_DTE)
+    if cached_window is not None:
+        window_min, window_max = min(window_min, cached_window[0]), max(window_max, cached_window[1])
+    return window_min, window_max
+
+
+def is_narrower(window: Tuple[int, int], other: Tuple[int, int]) -> bool:
+    """True if other covers window and is strictly wider"""
+    return other[0] <= window[0] and window[1] <= other[1] and other != tuple(window)
+
+
+class ChainCache:
+    """
+    Thread-safe TTL + LRU cache of options chain DataFrames.
+
+    One entry is kept per (symbol, contract_type) along with the DTE window
+    it was fetched for. Returned frames are fresh copies, so callers may
+    modify them (calculate_metrics adds columns in place).
+    """
+
+    shared = False  # Entries are private to this process (see shared_chain_cache.py)
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_mb: Optional[float] = None):
+        self.ttl_seconds = DEFAULT_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.max_bytes = int((DEFAULT_MAX_MB if max_mb is None else max_mb) * 1024 * 1024)
+
+        # (symbol, contract_type) -> (stored_at, (min_dte, max_dte), nbytes, DataFrame)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def fetch_window(self, min_dte: int, max_dte: int, symbol: Optional[str] = None,
+                     contract_type: str = 'put') -> Tuple[int, int]:
+        """
+        DTE window to fetch so the result can also serve other users' requests.
+        
+        Given a symbol, the window also covers that chain's fresh cached window,
+        so a refresh (e.g. pre-warm) never narrows what the cache can serve.
+        """
+        return widen_window(min_dte, max_dte, self._fresh_window(symbol, contract_type) if symbol else None)
+
+    def _fresh_window(self, symbol: str, contract_type: str) -> Optional[Tuple[int, int]]:
+        """DTE window of the fresh entry for a chain, or None"""
+        with self._lock:
+            entry = self._entries.get((symbol, contract_type))
+            if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+                return None
+            return entry[1]
+
+    def get(self, symbol: str, min_dte: int, max_dte: int,
+            contract_type: str = 'put') -> Optional[pd.DataFrame]:
+        """
+        Return the cached chain sliced to [min_dte, max_dte], or None if there
+        is no fresh entry covering that window.
+        """
+        key = (symbol, contract_type)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            stored_at, (window_min, window_max), _, df = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            if min_dte < window_min or max_dte > window_max:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        dte = df['dte'].to_numpy()
+        mask = (dte >= min_dte) & (dte <= max_dte)
+        return df[mask].reset_index(drop=True)
+
+    def put(self, symbol: str, df: pd.DataFrame, min_dte: int, max_dte: int,
+            contract_type: str = 'put', fetched_at: Optional[float] = None) -> None:
+        """
+        Store a chain fetched over [min_dte, max_dte], evicting LRU entries if over budget.
+        
+        fetched_at is the Unix time the data was fetched (default: now); chains
+        loaded from a snapshot pass it so their TTL is not restarted.
+        """
+        if df is None or df.empty:
+            return
+
+        stored_at = time.monotonic()
+        if fetched_at is not None:
+            stored_at -= max(0.0, time.time() - fetched_at)
+
+        nbytes = int(df.memory_usage(deep=True).sum())
+        if nbytes > self.max_bytes:
+            return
+
+        key = (symbol, contract_type)
+        with self._lock:
+            if key in self._entries:
+                existing_at, window, _, _ = self._entries[key]
+                # A narrower chain never replaces a fresh wider one
+                if (time.monotonic() - existing_at <= self.ttl_seconds
+                        and is_narrower((min_dte, max_dte), window)):
+                    return
+                self._remove(key)
+
+            self._entries[key] = (stored_at, (min_dte, max_dte), nbytes, df.copy())
+            self._bytes += nbytes
+
+            while self._bytes > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    @contextmanager
+    def fetch_lock(self, symbol: str, contract_type: str = 'put'):
+        """No cross-process locking needed; in-process fetches are merged by SingleFlight"""
+        yield
+
+    def clear(self) -> None:
+        """Drop all cached chains (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current memory usage"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl_seconds,
+                'window_dte': [CHAIN_WINDOW_MIN_DTE, CHAIN_WINDOW_MAX_DTE],
+            }
+
+    def _remove(self, key) -> None:
+        """Remove an entry (caller holds the lock)"""
+        _, _, nbytes, _ = self._entries.pop(key)
+        self._bytes -= nbytes
+
+
+class _Flight:
+    """One in-flight call and the outcome its waiters receive"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Deduplicate concurrent calls by key.
+
+    The first caller for a key runs the function; callers arriving while it
+    runs block until it finishes and receive the same result (or exception).
+    Nothing is kept once the call completes - caching is the caller's job.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run fn once per concurrent key.
+
+        Returns:
+            Tuple of (result, shared) where shared is True if this caller
+            waited on another caller's in-flight call
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.executed += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+        try:
+            flight.result = fn()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+        return flight.result, False
+
+    def stats(self) -> Dict[str, Any]:
+        """Calls executed vs. merged into an in-flight call"""
+        with self._lock:
+            total = self.executed + self.coalesced
+            return {
+                'executed': self.executed,
+                'coalesced': self.coalesced,
+                'coalesced_ratio': round(self.coalesced / total, 4) if total else 0.0,
+                'in_flight': len(self._flights),
+            }
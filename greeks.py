@@ -0,0 +1,218 @@
+"""
+Black-Scholes Greeks - Vectorized pricing and Greeks for whole options chains
+- Portions generated by AI
+
+Used when a data source has no Greeks (Yahoo Finance). Every function takes
+scalars or NumPy arrays and broadcasts them, so a full chain is priced in a
+single call.
+
+Units match the Massive.com API so both sources screen the same way:
+- theta: change in price per calendar day
+- vega: change in price per 1 volatility point (1%)
+- rho: change in price per 1 rate point (1%)
+"""
+
+import os
+from typing import Dict, Optional
+
+import numpy as np
+from scipy.special import ndtr
+
+# Defaults used when config['pricing'] does not override them
+RISK_FREE_RATE = float(os.getenv("RISK_FREE_RATE", "0.05"))
+DIVIDEND_YIELD = float(os.getenv("DIVIDEND_YIELD", "0.0"))
+
+CALENDAR_DAYS_PER_YEAR = 365
+_INV_SQRT_2PI = 1.0 / np.sqrt(2.0 * np.pi)
+
+
+def pricing_inputs(config: Optional[dict] = None):
+    """
+    Get (risk_free_rate, dividend_yield) from config['pricing'], falling back
+    to the RISK_FREE_RATE / DIVIDEND_YIELD environment defaults.
+    """
+    pricing = (config or {}).get('pricing', {})
+    return (
+        float(pricing.get('risk_free_rate', RISK_FREE_RATE)),
+        float(pricing.get('dividend_yield', DIVIDEND_YIELD)),
+    )
+
+
+def _norm_pdf(x):
+    return _INV_SQRT_2PI * np.exp(-0.5 * x * x)
+
+
+def black_scholes_greeks(S, K, T, sigma, r: Optional[float] = None, q: Optional[float] = None,
+                         option_type: str = 'put', model: str = 'black_scholes') -> Dict[str, np.ndarray]:
+    """
+    Price and first-order Greeks for European options.
+
+    Args:
+        S: Underlying price (forward price when model='black76')
+        K: Strike price
+        T: Time to expiration in years
+        sigma: Implied volatility (0.25 = 25%)
+        r: Risk-free rate (default: RISK_FREE_RATE)
+        q: Continuous dividend yield (default: DIVIDEND_YIELD, ignored for black76)
+        option_type: 'put' or 'call'
+        model: 'black_scholes' (Black-Scholes-Merton) or 'black76' (options on forwards/futures)
+
+    Returns:
+        Dict of arrays: price, delta, gamma, theta, vega, rho.
+        Rows with non-positive S, K, T or sigma are NaN.
+    """
+    r = RISK_FREE_RATE if r is None else r
+    q = DIVIDEND_YIELD if q is None else q
+    if model == 'black76':
+        q = r  # A forward has zero cost of carry
+    elif model != 'black_scholes':
+        raise ValueError(f"Unknown model: {model}")
+
+    S, K, T, sigma = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (S, K, T, sigma)))
+    valid = (S > 0) & (K > 0) & (T > 0) & (sigma > 0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sqrt_T = np.sqrt(T)
+        sigma_sqrt_T = sigma * sqrt_T
+        d1 = (np.log(S / K) + (r - q + 0.5 * sigma * sigma) * T) / sigma_sqrt_T
+        d2 = d1 - sigma_sqrt_T
+
+    discount = np.exp(-r * T)
+    carry = np.exp(-q * T)
+    pdf_d1 = _norm_pdf(d1)
+
+    if option_type == 'call':
+        n_d1, n_d2 = ndtr(d1), ndtr(d2)
+        price = S * carry * n_d1 - K * discount * n_d2
+        delta = carry * n_d1
+        theta_carry = -r * K * discount * n_d2 + q * S * carry * n_d1
+        rho = K * T * discount * n_d2
+    elif option_type == 'put':
+        n_d1, n_d2 = ndtr(-d1), ndtr(-d2)
+        price = K * discount * n_d2 - S * carry * n_d1
+        delta = -carry * n_d1
+        theta_carry = r * K * discount * n_d2 - q * S * carry * n_d1
+        rho = -K * T * discount * n_d2
+    else:
+        raise ValueError(f"Unknown option type: {option_type}")
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        gamma = carry * pdf_d1 / (S * sigma_sqrt_T)
+        theta = -S * carry * pdf_d1 * sigma / (2 * sqrt_T) + theta_carry
+    vega = S * carry * pdf_d1 * sqrt_T
+
+    if model == 'black76':
+        # The forward is held fixed, so only discounting depends on the rate
+        rho = -T * price
+
+    greeks = {
+        'price': price,
+        'delta': delta,
+        'gamma': gamma,
+        'theta': theta / CALENDAR_DAYS_PER_YEAR,
+        'vega': vega / 100,
+        'rho': rho / 100,
+    }
+    return {name: np.where(valid, values, np.nan) for name, values in greeks.items()}
+
+
+def _price_and_vega(S, K, T, sigma, r, q, option_type):
+    """Black-Scholes-Merton price and vega per 1.0 of volatility (no unit scaling)"""
+    sqrt_T = np.sqrt(T)
+    sigma_sqrt_T = sigma * sqrt_T
+    d1 = (np.log(S / K) + (r - q + 0.5 * sigma * sigma) * T) / sigma_sqrt_T
+    d2 = d1 - sigma_sqrt_T
+    discount = np.exp(-r * T)
+    carry = np.exp(-q * T)
+
+    if option_type == 'call':
+        price = S * carry * ndtr(d1) - K * discount * ndtr(d2)
+    else:
+        price = K * discount * ndtr(-d2) - S * carry * ndtr(-d1)
+    return price, S * carry * _norm_pdf(d1) * sqrt_T
+
+
+def implied_volatility(price, S, K, T, r: Optional[float] = None, q: Optional[float] = None,
+                       option_type: str = 'put', model: str = 'black_scholes',
+                       tol: float = 1e-6, max_iter: int = 100,
+                       vol_bounds=(1e-4, 5.0)) -> np.ndarray:
+    """
+    Solve implied volatility for many contracts at once.
+
+    Runs Newton-Raphson on every unsolved contract in parallel. Each contract
+    keeps a [low, high] volatility bracket; whenever a Newton step would leave
+    the bracket (flat vega, far-from-money strikes) it falls back to bisection,
+    so the solver always converges for prices inside the no-arbitrage bounds.
+
+    Args:
+        price: Option prices
+        S, K, T: Underlying (forward for black76), strike, years to expiration
+        r, q, option_type, model: As in black_scholes_greeks
+        tol: Absolute price tolerance
+        max_iter: Maximum iterations
+        vol_bounds: (min, max) volatility searched
+
+    Returns:
+        Array of implied volatilities; NaN where no volatility in vol_bounds
+        reproduces the price (stale or arbitrage-violating quotes, bad inputs).
+    """
+    r = RISK_FREE_RATE if r is None else r
+    q = DIVIDEND_YIELD if q is None else q
+    if model == 'black76':
+        q = r
+    elif model != 'black_scholes':
+        raise ValueError(f"Unknown model: {model}")
+    if option_type not in ('put', 'call'):
+        raise ValueError(f"Unknown option type: {option_type}")
+
+    price, S, K, T = (np.array(x, dtype=float) for x in np.broadcast_arrays(price, S, K, T))
+    iv = np.full(price.shape, np.nan)
+
+    low_vol, high_vol = vol_bounds
+    valid = (price > 0) & (S > 0) & (K > 0) & (T > 0)
+    idx = np.flatnonzero(valid)
+    if len(idx) == 0:
+        return iv
+
+    p, s, k, t = price[idx], S[idx], K[idx], T[idx]
+
+    # Prices outside what the volatility range can produce have no solution
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        p_low, _ = _price_and_vega(s, k, t, np.full_like(p, low_vol), r, q, option_type)
+        p_high, _ = _price_and_vega(s, k, t, np.full_like(p, high_vol), r, q, option_type)
+    solvable = (p >= p_low - tol) & (p <= p_high + tol)
+    idx, p, s, k, t = idx[solvable], p[solvable], s[solvable], k[solvable], t[solvable]
+
+    lo = np.full_like(p, low_vol)
+    hi = np.full_like(p, high_vol)
+    # Brenner-Subrahmanyam starting point, kept inside the bracket
+    sigma = np.clip(np.sqrt(2 * np.pi / t) * p / s, 0.05, 2.0)
+    active = np.arange(len(p))
+
+    for _ in range(max_iter):
+        if len(active) == 0:
+            break
+        sa = sigma[active]
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            model_price, vega = _price_and_vega(s[active], k[active], t[active], sa, r, q, option_type)
+        diff = model_price - p[active]
+
+        done = np.abs(diff) < tol
+        # Price rises with volatility: too expensive -> shrink high end, else raise low end
+        lo[active] = np.where(diff < 0, sa, lo[active])
+        hi[active] = np.where(diff > 0, sa, hi[active])
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            newton = sa - diff / vega
+        la, ha = lo[active], hi[active]
+        in_bracket = np.isfinite(newton) & (newton > la) & (newton < ha)
+        sigma[active] = np.where(done, sa, np.where(in_bracket, newton, 0.5 * (la + ha)))
+
+        # Stop on price convergence or once the bracket has collapsed
+        done |= (ha - la) < 1e-10
+        active = active[~done]
+
+    solved = np.ones(len(p), dtype=bool)
+    solved[active] = False
+    iv[idx[solved]] = sigma[solved]
+    return iv
@@ -5,22 +5,41 @@ Massive.com API Client - Wrapper for options screener integration
 Data sources:
 - Stock prices: Yahoo Finance (real-time)
 - Options prices: Massive.com API (last_trade.price, fallback to day.close)
-- Options Greeks: Massive.com API (delta, gamma, theta, vega, IV - no local calculation)
+- Options Greeks: Massive.com API (delta, gamma, theta, vega, IV); solved locally only
+  for priced contracts the API returns without them
 - Volume & Open Interest: Massive.com API
 
 Note: Options data is 15-minute delayed per Massive.com plan.
 """
 
 import os
+import json
+import queue
+import threading
+import time
+import numpy as np
 import pandas as pd
-import yfinance as yf
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Callable, Iterable, Iterator, Optional, Tuple
+from urllib.parse import urlparse
 from dotenv import load_dotenv
 
+from chain_cache import ChainCache, SingleFlight
+from shared_chain_cache import SharedChainCache, shared_cache_enabled
+from price_service import get_spot_price
+from snapshot_store import snapshot_store
+from greeks import black_scholes_greeks, implied_volatility, pricing_inputs, CALENDAR_DAYS_PER_YEAR
+
 # Load environment variables
 load_dotenv()
 
+# Solve IV / compute Greeks locally for priced contracts the API returns without them
+BACKFILL_GREEKS = os.getenv("MASSIVE_BACKFILL_GREEKS", "true").lower() in ("1", "true", "yes")
+
+# Snapshot pagination: contracts per page (API max 250) and pages fetched ahead of parsing
+MASSIVE_PAGE_SIZE = int(os.getenv("MASSIVE_PAGE_SIZE", "250"))
+MASSIVE_PREFETCH_PAGES = int(os.getenv("MASSIVE_PREFETCH_PAGES", "2"))
+
 
 class MassiveAPIClient:
     """
@@ -32,11 +51,14 @@ class MassiveAPIClient:
     - Options Greeks: Massive.com API (delta, gamma, theta, vega, IV)
     - Volume & Open Interest: Massive.com API
     
-    Note: Options data is 15-minute delayed per Massive.com plan.
+    Note: Options data is 15-minute delayed per Massive.com plan, so chains
+    are cached in memory for the delay window (see chain_cache.py).
     """
     
     def __init__(self):
         self.api_key = os.getenv('MASSIVE_API_KEY')
+        self.chain_cache = SharedChainCache() if shared_cache_enabled() else ChainCache()
+        self.chain_flights = SingleFlight()
         
         if not self.api_key:
             raise ValueError(
@@ -59,6 +81,9 @@ class MassiveAPIClient:
         """
         Get current stock price using Yahoo Finance (real-time).
         
+        Prices come from the batched spot price service (price_service.py),
+        so symbols prefetched with get_spot_prices are not requested again.
+        
         Args:
             symbol: Stock ticker symbol (e.g., 'AAPL')
             
@@ -66,13 +91,11 @@ class MassiveAPIClient:
             Stock price as float, or None if unavailable
         """
         try:
-            print(f"Fetching price for {symbol} from Yahoo Finance (for Massive mode)...")
-            stock = yf.Ticker(symbol)
-            current_price = stock.info.get('regularMarketPrice', stock.info.get('currentPrice'))
+            current_price = get_spot_price(symbol)
             
             if current_price and current_price > 0:
                 print(f"Yahoo Finance price for {symbol}: ${current_price:.2f}")
-                return round(current_price, 2)
+                return current_price
             else:
                 print(f"WARNING: Could not get price for {symbol}")
                 return None
@@ -108,7 +131,8 @@ class MassiveAPIClient:
             }
     
     
-    def get_options_chain(self, symbol: str, config: Dict[str, Any]) -> pd.DataFrame:
+    def get_options_chain(self, symbol: str, config: Dict[str, Any],
+                          contract_type: str = 'put', use_cache: bool = True) -> pd.DataFrame:
         """
         Get options chain with prices and Greeks from Massive.com API.
         
@@ -117,20 +141,85 @@ class MassiveAPIClient:
         - Greeks: delta, gamma, theta, vega (no local calculation needed)
         - IV, Volume, Open Interest
         
+        Chains are fetched once per symbol over a wide expiration window and
+        cached for the data delay; any DTE range inside that window is served
+        by slicing the cached frame instead of a new upstream query. Cache
+        misses for a chain that another request is already fetching wait for
+        that fetch instead of paging through the API again. With
+        CHAIN_SNAPSHOT_DIR set, fetched windows are also persisted to disk and
+        a fresh snapshot is loaded instead of fetching after a restart. With
+        SHARED_CHAIN_CACHE_DIR set, the cache is shared by all worker processes.
+        
         Args:
             symbol: Stock ticker symbol
             config: Configuration dictionary with options_strategy settings
+            contract_type: 'put' or 'call' (default: 'put')
+            use_cache: Set False to bypass the caches (memory and disk) and force a fresh fetch
             
         Returns:
             DataFrame with options data including prices and API-provided Greeks
         """
+        # Extract DTE range from config
+        max_dte = config['options_strategy']['max_dte']
+        min_dte = config['options_strategy'].get('min_dte', 0)
+        
+        if use_cache:
+            cached = self.chain_cache.get(symbol, min_dte, max_dte, contract_type)
+            if cached is not None:
+                print(f"Using cached options chain for {symbol} ({len(cached)} contracts)")
+                return cached
+        
+        # Fetch the shared superset window (once across concurrent requests), then slice it
+        window_min, window_max = self.chain_cache.fetch_window(min_dte, max_dte, symbol, contract_type)
+        
+        def fetch_and_store():
+            with self.chain_cache.fetch_lock(symbol, contract_type):
+                # Another worker process may have published the chain while we waited
+                if use_cache and self.chain_cache.shared:
+                    published = self.chain_cache.get(symbol, window_min, window_max, contract_type)
+                    if published is not None:
+                        return published
+                
+                snapshot = None
+                if use_cache:
+                    snapshot = snapshot_store.load('massive', symbol, window_min, window_max, contract_type)
+                if snapshot is not None:
+                    # Keep the snapshot's age so its TTL does not restart
+                    fetched, fetched_at = snapshot
+                else:
+                    fetched = self._fetch_options_chain(symbol, window_min, window_max, contract_type)
+                    fetched_at = None
+                    snapshot_store.save('massive', symbol, fetched, window_min, window_max, contract_type)
+                self.chain_cache.put(symbol, fetched, window_min, window_max, contract_type, fetched_at=fetched_at)
+                return fetched
+        
+        df, shared = self.chain_flights.do(
+            (symbol, contract_type, window_min, window_max), fetch_and_store
+        )
+        if shared:
+            print(f"Joined in-flight options chain fetch for {symbol} ({len(df)} contracts)")
+        if df.empty:
+            return pd.DataFrame()
+        
+        return df[(df['dte'] >= min_dte) & (df['dte'] <= max_dte)].reset_index(drop=True)
+    
+    def _fetch_options_chain(self, symbol: str, min_dte: int, max_dte: int,
+                             contract_type: str = 'put') -> pd.DataFrame:
+        """
+        Fetch an options chain from Massive.com (no caching).
+        
+        Args:
+            symbol: Stock ticker symbol
+            min_dte: Minimum days to expiration
+            max_dte: Maximum days to expiration
+            contract_type: 'put' or 'call'
+            
+        Returns:
+            DataFrame with options data, or empty DataFrame on error
+        """
         try:
             print(f"Fetching options chain for {symbol} from Massive.com (with API Greeks)...")
             
-            # Extract DTE range from config
-            max_dte = config['options_strategy']['max_dte']
-            min_dte = config['options_strategy'].get('min_dte', 0)
-            
             # Calculate date range for expiration filtering
             today = datetime.now().date()
             min_exp_date = (today + timedelta(days=min_dte)).isoformat()
@@ -142,113 +231,41 @@ class MassiveAPIClient:
             params = {
                 "expiration_date.gte": min_exp_date,
                 "expiration_date.lte": max_exp_date,
-                "contract_type": "put"  # Only get PUT options
+                "contract_type": contract_type,
+                "limit": MASSIVE_PAGE_SIZE
             }
             
             # Fetch options chain from Massive - gets Greeks and prices without calculation!
-            options_data = []
-            options_count = 0
-            skipped_no_greeks = 0
+            # A pager thread fetches the next pages while this thread parses the current one.
+            from massive.rest.models.snapshot import OptionContractSnapshot
             
-            for option in self.client.list_snapshot_options_chain(symbol, params=params):
-                options_count += 1
-                
-                # Extract option details
-                details = option.details if hasattr(option, 'details') else None
-                if not details:
-                    continue
-                
-                strike = getattr(details, 'strike_price', None)
-                expiration = getattr(details, 'expiration_date', None)
-                ticker = getattr(details, 'ticker', '')
-                
-                if strike is None or expiration is None:
-                    continue
-                
-                # Calculate DTE
-                try:
-                    exp_date = datetime.strptime(str(expiration), '%Y-%m-%d').date()
-                    dte = (exp_date - today).days
-                except:
-                    continue
-                
-                # Extract Greeks directly from API (NO CALCULATION!)
-                greeks = option.greeks if hasattr(option, 'greeks') else None
-                if not greeks or getattr(greeks, 'delta', None) is None:
-                    skipped_no_greeks += 1
-                    continue  # Skip options without Greeks
-                
-                delta = float(greeks.delta)
-                gamma = float(greeks.gamma) if greeks.gamma else 0
-                theta = float(greeks.theta) if greeks.theta else 0
-                vega = float(greeks.vega) if greeks.vega else 0
-                rho = float(greeks.rho) if getattr(greeks, 'rho', None) else 0
-                
-                # Get implied volatility from API
-                iv = getattr(option, 'implied_volatility', None)
-                if iv is None:
-                    continue  # Need IV for screening
-                iv = float(iv)
-                
-                # Get volume and open interest from Massive
-                open_interest = getattr(option, 'open_interest', 0) or 0
-                
-                volume = 0
-                if hasattr(option, 'day') and option.day:
-                    volume = getattr(option.day, 'volume', 0) or 0
-                
-                # Extract price from Massive API
-                # Priority: last_trade.price > day.close (quotes not available on this plan)
-                last_trade = getattr(option, 'last_trade', None)
-                day_data = getattr(option, 'day', None)
-                
-                option_price = None
-                price_source = None
-                
-                # Try last trade price first (primary source)
-                if last_trade and getattr(last_trade, 'price', None):
-                    option_price = float(last_trade.price)
-                    price_source = 'last_trade'
-                # Fallback to daily close price (for options that haven't traded recently)
-                elif day_data:
-                    close_price = getattr(day_data, 'close', None)
-                    if close_price and close_price > 0:
-                        option_price = float(close_price)
-                        price_source = 'day_close'
-                
-                # Skip options without valid price (can't calculate returns)
-                if option_price is None or option_price <= 0:
-                    continue
-                
-                # Build option row with all data from Massive API
-                option_row = {
-                    'symbol': symbol,
-                    'strike': float(strike),
-                    'expiry': str(expiration),
-                    'dte': dte,
-                    'volume': int(volume),
-                    'open_interest': int(open_interest),
-                    'openInterest': int(open_interest),
-                    'lastPrice': option_price,     # From Massive API (last_trade or mid-price)
-                    'price_source': price_source,  # Track where price came from
-                    'impliedVolatility': iv,       # From Massive API
-                    'delta': delta,                # From Massive API - NOT calculated!
-                    'gamma': gamma,                # From Massive API
-                    'theta': theta,                # From Massive API
-                    'vega': vega,                  # From Massive API
-                    'rho': rho,                    # From Massive API
-                    'contract_symbol': ticker
-                }
-                
-                options_data.append(option_row)
+            started = time.perf_counter()
+            page_times = []
             
-            if not options_data:
+            def snapshots():
+                pages = prefetch(iter_snapshot_pages(self.client, symbol, params), MASSIVE_PREFETCH_PAGES)
+                for results, fetch_seconds in pages:
+                    page_times.append(fetch_seconds)
+                    print(f"  Page {len(page_times)}: {len(results)} contracts in {fetch_seconds * 1000:.0f} ms")
+                    for result in results:
+                        yield OptionContractSnapshot.from_dict(result)
+            
+            df, counts = snapshots_to_frame(
+                snapshots(), symbol, today,
+                backfill=BACKFILL_GREEKS,
+                spot_price_fn=lambda: self.get_stock_price(symbol)
+            )
+            print(f"  {len(page_times)} pages: {sum(page_times) * 1000:.0f} ms fetching, "
+                  f"{(time.perf_counter() - started) * 1000:.0f} ms to last row "
+                  f"(page size {MASSIVE_PAGE_SIZE}, prefetch {MASSIVE_PREFETCH_PAGES})")
+            
+            if df.empty:
                 print(f"No valid options data found for {symbol}")
                 return pd.DataFrame()
             
-            df = pd.DataFrame(options_data)
-            print(f"  Retrieved {len(df)} PUT options with prices and Greeks from Massive")
-            print(f"  (Scanned: {options_count}, Skipped without Greeks: {skipped_no_greeks})")
+            print(f"  Retrieved {len(df)} {contract_type.upper()} options with prices and Greeks from Massive")
+            print(f"  (Scanned: {counts['scanned']}, Recovered Greeks: {counts['recovered']}, "
+                  f"Skipped without Greeks: {counts['skipped_no_greeks']})")
             return df
                 
         except Exception as e:
@@ -279,32 +296,9 @@ class MassiveAPIClient:
             
             news_items = []
             for news in self.client.list_ticker_news(symbol, order="desc", limit=limit * 2):  # Fetch more to filter
-                # Parse the published date
-                published_str = news.published_utc
-                try:
-                    # Handle ISO format with Z or timezone
-                    if isinstance(published_str, str):
-                        published_str = published_str.replace('Z', '+00:00')
-                        published_date = datetime.fromisoformat(published_str)
-                    else:
-                        published_date = published_str
-                    
-                    # Skip news older than max_age_days
-                    if published_date < cutoff_date:
-                        continue
-                    
-                    # Format date for display (e.g., "Jan 20")
-                    date_display = published_date.strftime("%b %d")
-                except:
-                    date_display = ""
-                
-                news_items.append({
-                    'title': news.title,
-                    'url': news.article_url,
-                    'published': news.published_utc,
-                    'date_display': date_display,
-                    'source': getattr(news.publisher, 'name', '') if hasattr(news, 'publisher') and news.publisher else ''
-                })
+                item = format_news_item(news, cutoff_date)
+                if item is not None:
+                    news_items.append(item)
                 
                 if len(news_items) >= limit:
                     break
@@ -313,6 +307,328 @@ class MassiveAPIClient:
         except Exception as e:
             print(f"Error fetching news for {symbol}: {str(e)}")
             return []
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and memory usage of the options chain cache, plus coalesced fetches"""
+        stats = self.chain_cache.stats()
+        stats['fetches'] = self.chain_flights.stats()
+        stats['snapshots'] = snapshot_store.stats()
+        return stats
+
+
+def iter_snapshot_pages(rest_client, symbol: str, params: Dict[str, Any]) -> Iterator[Tuple[list, float]]:
+    """
+    Yield (raw results, fetch seconds) for each page of an options chain snapshot.
+    
+    Follows next_url the same way RESTClient._paginate_iter does, but hands
+    back whole undecoded pages so they can be fetched ahead of parsing.
+    """
+    started = time.perf_counter()
+    response = rest_client.list_snapshot_options_chain(symbol, params=params, raw=True)
+    
+    while True:
+        page = json.loads(response.data)
+        yield page.get('results') or [], time.perf_counter() - started
+        
+        next_url = page.get('next_url')
+        if not next_url:
+            return
+        
+        parsed = urlparse(next_url)
+        path = parsed.path + (f"?{parsed.query}" if parsed.query else "")
+        started = time.perf_counter()
+        response = rest_client._get(path=path, params={}, raw=True)
+
+
+def prefetch(items: Iterable, depth: int) -> Iterator:
+    """
+    Iterate items on a background thread, keeping up to depth of them ready.
+    
+    Blocking work inside the source iterator (HTTP requests) overlaps with
+    whatever the caller does between items. Exceptions from the source are
+    re-raised in the caller; abandoning the iterator stops the thread.
+    depth <= 0 iterates inline.
+    """
+    if depth <= 0:
+        yield from items
+        return
+    
+    ready = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    
+    def put(entry):
+        while not stop.is_set():
+            try:
+                ready.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def produce():
+        try:
+            for item in items:
+                if not put(('item', item)):
+                    return
+            put(('done', None))
+        except BaseException as e:
+            put(('error', e))
+    
+    threading.Thread(target=produce, daemon=True, name="massive-pager").start()
+    try:
+        while True:
+            kind, value = ready.get()
+            if kind == 'done':
+                return
+            if kind == 'error':
+                raise value
+            yield value
+    finally:
+        stop.set()
+
+
+def format_news_item(news, cutoff_date) -> Optional[Dict[str, Any]]:
+    """
+    Convert a TickerNews object into a display dict.
+    
+    Returns:
+        Dict with title, url, published, date_display and source, or None
+        if the article was published before cutoff_date
+    """
+    # Parse the published date
+    published_str = news.published_utc
+    try:
+        # Handle ISO format with Z or timezone
+        if isinstance(published_str, str):
+            published_str = published_str.replace('Z', '+00:00')
+            published_date = datetime.fromisoformat(published_str)
+        else:
+            published_date = published_str
+        
+        # Skip news older than max_age_days
+        if published_date < cutoff_date:
+            return None
+        
+        # Format date for display (e.g., "Jan 20")
+        date_display = published_date.strftime("%b %d")
+    except:
+        date_display = ""
+    
+    return {
+        'title': news.title,
+        'url': news.article_url,
+        'published': news.published_utc,
+        'date_display': date_display,
+        'source': getattr(news.publisher, 'name', '') if hasattr(news, 'publisher') and news.publisher else ''
+    }
+
+
+# Columns produced by snapshots_to_frame, in output order
+CHAIN_COLUMNS = [
+    'symbol', 'strike', 'expiry', 'dte', 'volume', 'open_interest', 'openInterest',
+    'lastPrice', 'price_source', 'impliedVolatility', 'delta', 'gamma', 'theta',
+    'vega', 'rho', 'greeks_source', 'contract_symbol'
+]
+
+
+def snapshots_to_frame(snapshots, symbol: str, today, backfill: bool = True,
+                       spot_price_fn: Optional[Callable[[], Optional[float]]] = None
+                       ) -> Tuple[pd.DataFrame, Dict[str, int]]:
+    """
+    Convert Massive.com option snapshots into an options chain DataFrame.
+    
+    Fields are gathered into plain column lists in a single pass; DTE is
+    computed once per unique expiration and the Greeks/IV/price validity
+    rules are applied as vectorized masks:
+    - Requires details with strike and a parseable expiration
+    - Requires delta and implied volatility (missing gamma/theta/vega/rho -> 0)
+    - Price is last_trade.price, falling back to day.close; must be > 0
+    
+    With backfill enabled, priced contracts the API returns without IV are
+    given an IV solved from their price, and contracts without Greeks get
+    Black-Scholes Greeks from that IV (greeks_source='computed'), instead of
+    being dropped.
+    
+    Args:
+        snapshots: Iterable of OptionContractSnapshot objects
+        symbol: Underlying ticker symbol
+        today: Date used to compute days to expiration
+        backfill: Recover missing IV/Greeks locally
+        spot_price_fn: Called for the underlying price when back-filling and
+            the snapshots carry no underlying_asset.price
+        
+    Returns:
+        Tuple of (DataFrame with CHAIN_COLUMNS, counts dict with
+        'scanned', 'recovered' and 'skipped_no_greeks')
+    """
+    strikes, expirations, tickers, contract_types = [], [], [], []
+    underlying_prices = []
+    deltas, gammas, thetas, vegas, rhos = [], [], [], [], []
+    ivs, open_interests, volumes, trade_prices, close_prices = [], [], [], [], []
+    
+    for option in snapshots:
+        details = option.details
+        if details is not None:
+            strikes.append(details.strike_price)
+            expirations.append(details.expiration_date)
+            tickers.append(details.ticker)
+            contract_types.append(details.contract_type)
+        else:
+            strikes.append(None)
+            expirations.append(None)
+            tickers.append(None)
+            contract_types.append(None)
+        
+        greeks = option.greeks
+        if greeks is not None:
+            deltas.append(greeks.delta)
+            gammas.append(greeks.gamma)
+            thetas.append(greeks.theta)
+            vegas.append(greeks.vega)
+            rhos.append(getattr(greeks, 'rho', None))
+        else:
+            deltas.append(None)
+            gammas.append(None)
+            thetas.append(None)
+            vegas.append(None)
+            rhos.append(None)
+        
+        ivs.append(option.implied_volatility)
+        open_interests.append(option.open_interest)
+        
+        day = option.day
+        if day is not None:
+            volumes.append(day.volume)
+            close_prices.append(day.close)
+        else:
+            volumes.append(None)
+            close_prices.append(None)
+        
+        last_trade = option.last_trade
+        trade_prices.append(last_trade.price if last_trade is not None else None)
+        
+        underlying = option.underlying_asset
+        underlying_prices.append(underlying.price if underlying is not None else None)
+    
+    scanned = len(strikes)
+    if scanned == 0:
+        return pd.DataFrame(), {'scanned': 0, 'recovered': 0, 'skipped_no_greeks': 0}
+    
+    # None -> NaN for all numeric columns
+    def as_float(values):
+        return np.array(values, dtype=float)
+    
+    strike = as_float(strikes)
+    delta = as_float(deltas)
+    iv = as_float(ivs)
+    trade_price = as_float(trade_prices)
+    close_price = as_float(close_prices)
+    
+    # DTE: parse each unique expiration once
+    codes, unique_expirations = pd.factorize(pd.Series(expirations, dtype=object))
+    unique_dates = pd.to_datetime(
+        pd.Series(unique_expirations).astype(str), format='%Y-%m-%d', errors='coerce'
+    )
+    unique_dte = (unique_dates - pd.Timestamp(today)).dt.days.to_numpy(dtype=float)
+    dte = np.where(codes >= 0, unique_dte[np.maximum(codes, 0)], np.nan)
+    
+    # Price: last trade (primary), daily close (fallback)
+    use_trade = ~np.isnan(trade_price) & (trade_price != 0)
+    use_close = ~use_trade & (close_price > 0)
+    price = np.where(use_trade, trade_price, np.where(use_close, close_price, np.nan))
+    price_source = np.where(use_trade, 'last_trade', np.where(use_close, 'day_close', None))
+    
+    has_contract = ~np.isnan(strike) & ~np.isnan(dte)
+    missing = has_contract & (np.isnan(delta) | np.isnan(iv))
+    
+    greek_columns = {name: as_float(values) for name, values in
+                     (('gamma', gammas), ('theta', thetas), ('vega', vegas), ('rho', rhos))}
+    computed = np.zeros(scanned, dtype=bool)
+    
+    if backfill and np.any(missing & (price > 0)):
+        computed = _backfill_greeks(
+            strike, dte, price, iv, delta, greek_columns, missing & (price > 0),
+            np.array(contract_types, dtype=object), as_float(underlying_prices), spot_price_fn
+        )
+    
+    # Validity masks (same order as the API contract: details -> greeks -> IV -> price)
+    keep = has_contract & ~np.isnan(delta) & ~np.isnan(iv) & (price > 0)
+    recovered = int(np.count_nonzero(missing & keep))
+    skipped_no_greeks = int(np.count_nonzero(missing)) - recovered
+    
+    def zero_filled(values):
+        return np.nan_to_num(values[keep], nan=0.0)
+    
+    open_interest = zero_filled(as_float(open_interests)).astype(np.int64)
+    
+    df = pd.DataFrame({
+        'symbol': symbol,
+        'strike': strike[keep],
+        'expiry': unique_expirations.astype(str)[codes[keep]],
+        'dte': dte[keep].astype(np.int64),
+        'volume': zero_filled(as_float(volumes)).astype(np.int64),
+        'open_interest': open_interest,
+        'openInterest': open_interest,
+        'lastPrice': price[keep],                        # From Massive API (last_trade or day close)
+        'price_source': price_source[keep].astype(object),  # Track where price came from
+        'impliedVolatility': iv[keep],                   # From Massive API (solved when missing)
+        'delta': delta[keep],                            # From Massive API (computed when missing)
+        'gamma': zero_filled(greek_columns['gamma']),    # From Massive API
+        'theta': zero_filled(greek_columns['theta']),    # From Massive API
+        'vega': zero_filled(greek_columns['vega']),      # From Massive API
+        'rho': zero_filled(greek_columns['rho']),        # From Massive API
+        'greeks_source': np.where(computed[keep], 'computed', 'api').astype(object),
+        'contract_symbol': np.array(tickers, dtype=object)[keep]
+    }, columns=CHAIN_COLUMNS)
+    
+    return df, {'scanned': scanned, 'recovered': recovered, 'skipped_no_greeks': skipped_no_greeks}
+
+
+def _backfill_greeks(strike, dte, price, iv, delta, greek_columns, rows, contract_types,
+                     underlying_price, spot_price_fn) -> np.ndarray:
+    """
+    Fill missing IV and Greeks in place for the rows selected by the rows mask.
+    
+    IV is solved from the option price in one batched call per contract type;
+    Greeks are then computed from the (API or solved) IV for rows the API
+    returned without Greeks. Rows whose price no volatility can explain
+    (stale trades below intrinsic value) stay NaN and are dropped by the caller.
+    
+    Returns:
+        Boolean mask of rows where IV or Greeks were computed locally
+    """
+    spot = underlying_price
+    if np.isnan(spot[rows]).any():
+        fallback = spot_price_fn() if spot_price_fn is not None else None
+        if fallback:
+            spot = np.where(np.isnan(spot), fallback, spot)
+    
+    r, q = pricing_inputs()
+    T = np.maximum(dte, 1) / CALENDAR_DAYS_PER_YEAR
+    computed = np.zeros(len(strike), dtype=bool)
+    
+    for option_type in ('put', 'call'):
+        selected = rows & (contract_types == option_type) & (spot > 0)
+        
+        solve = np.flatnonzero(selected & np.isnan(iv))
+        if len(solve):
+            iv[solve] = implied_volatility(
+                price[solve], spot[solve], strike[solve], T[solve], r=r, q=q, option_type=option_type
+            )
+        
+        fill = np.flatnonzero(selected & np.isnan(delta) & ~np.isnan(iv))
+        if len(fill):
+            greeks = black_scholes_greeks(
+                spot[fill], strike[fill], T[fill], iv[fill], r=r, q=q, option_type=option_type
+            )
+            delta[fill] = greeks['delta']
+            for name, values in greek_columns.items():
+                values[fill] = greeks[name]
+        
+        computed[solve] = True
+        computed[fill] = True
+    
+    return computed
 
 
 # Global instance for easy import
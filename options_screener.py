@@ -2,10 +2,16 @@ import pandas as pd
 import numpy as np
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from scipy.stats import norm
 import yfinance as yf
 from massive_api_client import massive_client
+from greeks import black_scholes_greeks, pricing_inputs, CALENDAR_DAYS_PER_YEAR
+from price_service import get_spot_price, get_spot_prices
+from snapshot_store import snapshot_store
+
+# Expiries fetched at once per symbol from Yahoo Finance
+YAHOO_CHAIN_WORKERS = int(os.getenv("YAHOO_CHAIN_WORKERS", "8"))
 
 def load_config():
     """Load configuration from JSON file, create default if not exists"""
@@ -66,13 +72,11 @@ def save_config_file(config):
 def get_stock_price_yahoo(symbol):
     """Get current stock price using Yahoo Finance API"""
     try:
-        print(f"Fetching price for {symbol} from Yahoo Finance...")
-        stock = yf.Ticker(symbol)
-        current_price = stock.info.get('regularMarketPrice', stock.info.get('currentPrice'))
+        current_price = get_spot_price(symbol)
         
         if current_price and current_price > 0:
             print(f"Yahoo Finance price for {symbol}: ${current_price:.2f}")
-            return round(current_price, 2)
+            return current_price
         else:
             print(f"Yahoo Finance failed for {symbol} - using fallback")
             return generate_realistic_price(symbol)
@@ -123,54 +127,82 @@ def generate_realistic_price(symbol):
         return round(np.random.uniform(50, 200), 2)
 
 def get_options_chain_yahoo(symbol, config):
-    """Retrieve real options chain using Yahoo Finance"""
+    """
+    Retrieve real options chain using Yahoo Finance.
+    
+    Expiries are fetched concurrently and collected into a list for a single
+    concat. Yahoo has no Greeks, so delta, gamma, theta, vega and rho are
+    computed locally (rates from config['pricing'] or RISK_FREE_RATE /
+    DIVIDEND_YIELD); the stock price is fetched once per symbol.
+    
+    With CHAIN_SNAPSHOT_DIR set, a fresh on-disk snapshot covering the DTE
+    range is returned instead of fetching, and new fetches are persisted.
+    """
     try:
-        stock = yf.Ticker(symbol)
         max_dte = config['options_strategy']['max_dte']
         min_dte = config['options_strategy'].get('min_dte', 0)
         
+        snapshot = snapshot_store.load('yahoo', symbol, min_dte, max_dte)
+        if snapshot is not None:
+            return snapshot[0]
+        
+        stock = yf.Ticker(symbol)
+        now = datetime.now()
+        
         # Get expiry dates within DTE range
         expiry_dates = [date for date in stock.options
-                       if min_dte <= (pd.to_datetime(date) - datetime.now()).days <= max_dte]
+                       if min_dte <= (pd.to_datetime(date) - now).days <= max_dte]
         
-        all_options = pd.DataFrame()
+        if not expiry_dates:
+            return pd.DataFrame()
         
-        for date in expiry_dates:
+        def fetch_puts(date):
             try:
-                chain = stock.option_chain(date)
-                puts = chain.puts
+                puts = stock.option_chain(date).puts
                 puts['expiry'] = date
-                puts['dte'] = int((pd.to_datetime(date) - datetime.now()).days)
+                puts['dte'] = int((pd.to_datetime(date) - now).days)
                 puts['symbol'] = symbol
-                
-                # Calculate Greeks if not available
-                if 'delta' not in puts.columns:
-                    current_price = get_stock_price_yahoo(symbol)
-                    S = current_price
-                    K = puts['strike']
-                    T = puts['dte'] / 365
-                    r = 0.05  # Risk-free rate (approximate)
-                    sigma = puts['impliedVolatility']
-                    
-                    # Black-Scholes delta calculation for puts
-                    d1 = (np.log(S/K) + (r + sigma**2/2)*T) / (sigma*np.sqrt(T))
-                    puts['delta'] = -norm.cdf(-d1)
-                
-                # Ensure all required columns are present
-                if 'openInterest' in puts.columns:
-                    puts['open_interest'] = puts['openInterest']
-                elif 'open_interest' not in puts.columns:
-                    puts['open_interest'] = 0
-                
-                if 'volume' not in puts.columns:
-                    puts['volume'] = 0
-                
-                all_options = pd.concat([all_options, puts], ignore_index=True)
-                
+                return puts
             except Exception as e:
                 print(f"Error processing Yahoo Finance {symbol} for date {date}: {str(e)}")
-                continue
+                return None
+        
+        workers = max(1, min(YAHOO_CHAIN_WORKERS, len(expiry_dates)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            frames = [puts for puts in executor.map(fetch_puts, expiry_dates)
+                      if puts is not None and not puts.empty]
+        
+        if not frames:
+            return pd.DataFrame()
+        
+        all_options = pd.concat(frames, ignore_index=True)
         
+        # Calculate Greeks if not available (Black-Scholes, whole chain in one call)
+        if 'delta' not in all_options.columns:
+            current_price = get_stock_price_yahoo(symbol)
+            r, q = pricing_inputs(config)
+            greeks = black_scholes_greeks(
+                S=current_price,
+                K=all_options['strike'].to_numpy(dtype=float),
+                T=np.maximum(all_options['dte'].to_numpy(dtype=float), 1) / CALENDAR_DAYS_PER_YEAR,
+                sigma=all_options['impliedVolatility'].to_numpy(dtype=float),
+                r=r,
+                q=q,
+                option_type='put'
+            )
+            for name in ('delta', 'gamma', 'theta', 'vega', 'rho'):
+                all_options[name] = greeks[name]
+        
+        # Ensure all required columns are present
+        if 'openInterest' in all_options.columns:
+            all_options['open_interest'] = all_options['openInterest']
+        elif 'open_interest' not in all_options.columns:
+            all_options['open_interest'] = 0
+        
+        if 'volume' not in all_options.columns:
+            all_options['volume'] = 0
+        
+        snapshot_store.save('yahoo', symbol, all_options, min_dte, max_dte)
         return all_options
         
     except Exception as e:
@@ -206,37 +238,119 @@ def get_options_chain(symbol, config, api_source="massive"):
         return get_options_chain_massive(symbol, config)
 
 def calculate_metrics(options_chain, current_price):
-    """Calculate additional metrics for options"""
+    """
+    Calculate additional metrics for options (vectorized, modifies options_chain in place).
+    Each unique expiry is parsed once; all other math runs on NumPy arrays.
+    """
     if options_chain.empty:
         return options_chain
     
+    strike = options_chain['strike'].to_numpy(dtype=float)
+    premium = options_chain['lastPrice'].to_numpy(dtype=float)
+    
     # Calculate if option is out of the money (strike price below current price for puts)
-    options_chain['out_of_the_money'] = options_chain['strike'] < current_price
+    options_chain['out_of_the_money'] = strike < current_price
     
     # Get current date
-    today = datetime.now().date()
+    today = pd.Timestamp(datetime.now().date())
     
-    # Calculate days to expiration (DTE)
-    options_chain['calendar_days'] = options_chain['expiry'].apply(
-        lambda x: max((datetime.strptime(x, '%Y-%m-%d').date() - today).days + 1, 1)
-    )
+    # Calculate days to expiration (DTE), parsing each unique expiry once
+    codes, unique_expiries = pd.factorize(options_chain['expiry'])
+    expiry_dates = pd.to_datetime(pd.Index(unique_expiries).astype(str), format='%Y-%m-%d')
+    days_to_expiry = (expiry_dates - today).days.to_numpy()
+    calendar_days = np.maximum(days_to_expiry[codes] + 1, 1)
+    options_chain['calendar_days'] = calendar_days
     
     # Calculate annualized return based on option premium using calendar time
-    CALENDAR_DAYS_PER_YEAR = 365
-    
     options_chain['annualized_return'] = (
-        options_chain['lastPrice'] / options_chain['strike'] * (CALENDAR_DAYS_PER_YEAR / options_chain['calendar_days']) * 100
+        premium / strike * (CALENDAR_DAYS_PER_YEAR / calendar_days) * 100
     )
     
     return options_chain
 
-def screen_options(options_df, config):
-    """Apply screening criteria to filter options"""
+def _sort_key(values, ascending):
+    """Convert a column to a float key where smaller sorts first (NaN always last)"""
+    if values.dtype.kind in 'biuf':
+        key = values.astype(float)
+    else:
+        codes, _ = pd.factorize(values, sort=True)
+        key = np.where(codes >= 0, codes, np.nan).astype(float)
+    return key if ascending else -key
+
+
+def _group_kth_values(values, groups, k):
+    """
+    k-th smallest value of each group (integer codes), found by partial
+    selection within each group's segment. NaN for groups with k rows or
+    fewer, or with fewer than k non-NaN values.
+    """
+    counts = np.bincount(groups)
+    ends = np.cumsum(counts)
+    segmented = values[np.argsort(groups, kind='stable')]
+    kth_values = np.full(len(counts), np.nan)
+    for group in np.flatnonzero(counts > k):
+        segment = segmented[ends[group] - counts[group]:ends[group]]
+        kth_values[group] = np.partition(segment, k - 1)[k - 1]
+    return kth_values
+
+
+def top_k_indices(keys, k, groups=None):
+    """
+    Return positions of the k best rows ordered by keys (primary key first).
+    
+    Uses a partial selection on the primary key (per group, with groups) so
+    only rows that can make the top k are fully sorted. With groups (integer
+    codes), the top k rows of each group are returned, grouped in code order.
+    """
+    n = len(keys[0])
+    positions = np.arange(n)
+    
+    if n > k:
+        primary = keys[0]
+        # Keep everything that beats or ties the k-th value, so secondary keys break ties
+        if groups is None:
+            kth_value = np.partition(primary, k - 1)[k - 1]
+            if not np.isnan(kth_value):
+                positions = np.flatnonzero(primary <= kth_value)
+        else:
+            # Groups without a k-th value (NaN) keep all their rows
+            thresholds = _group_kth_values(primary, groups, k)[groups]
+            positions = np.flatnonzero(np.isnan(thresholds) | (primary <= thresholds))
+    
+    # np.lexsort sorts by the last key first
+    sort_keys = [positions] + [key[positions] for key in reversed(keys)]
+    if groups is not None:
+        sort_keys.append(groups[positions])
+    order = positions[np.lexsort(sort_keys)]
+    
+    if groups is None:
+        return order[:k]
+    
+    # Rank within each group and keep the first k of each
+    sorted_groups = groups[order]
+    group_starts = np.r_[0, np.flatnonzero(sorted_groups[1:] != sorted_groups[:-1]) + 1]
+    group_sizes = np.diff(np.r_[group_starts, len(order)])
+    rank = np.arange(len(order)) - np.repeat(group_starts, group_sizes)
+    return order[rank < k]
+
+
+def screen_options(options_df, config, per_symbol=False):
+    """
+    Apply screening criteria to filter options.
+    
+    All predicates are evaluated in one pass over NumPy arrays and the top
+    max_results rows are picked with a partial selection instead of sorting
+    the whole filtered frame. Supports multi-column sort_by.
+    
+    With per_symbol=True, a frame holding many symbols is screened in a single
+    pass and up to max_results rows are kept for each symbol.
+    """
     if options_df.empty:
         return options_df
     
     criteria = config['screening_criteria']
     strategy = config['options_strategy']
+    output = config['output']
     
     # Rename openInterest to open_interest if needed
     if 'openInterest' in options_df.columns and 'open_interest' not in options_df.columns:
@@ -246,32 +360,27 @@ def screen_options(options_df, config):
     # e.g., 20% probability = delta >= -0.20 (delta between -0.20 and 0)
     max_prob = criteria.get('max_assignment_probability', 20) / 100
     
-    # Apply filtering conditions
-    conditions = {
-        'volume': options_df['volume'] >= strategy['min_volume'],
-        'open_interest': options_df['open_interest'] >= strategy['min_open_interest'],
-        'delta': options_df['delta'] >= -max_prob,  # Delta between -max_prob and 0
-        'annualized_return': options_df['annualized_return'] >= criteria['min_annualized_return'],
-        'out_of_the_money': options_df['out_of_the_money']
-    }
-    
-    # Combine all conditions
-    filtered = options_df[
-        conditions['volume'] &
-        conditions['open_interest'] &
-        conditions['delta'] &
-        conditions['annualized_return'] &
-        conditions['out_of_the_money']
-    ]
-    
-    # Sort results
-    sort_by = config['output']['sort_by']
-    filtered = filtered.sort_values(
-        by=sort_by,
-        ascending=[config['output']['sort_order'] == 'ascending'] * len(sort_by)
+    # Apply all filtering conditions in one pass
+    mask = (
+        (options_df['volume'].to_numpy(dtype=float) >= strategy['min_volume']) &
+        (options_df['open_interest'].to_numpy(dtype=float) >= strategy['min_open_interest']) &
+        (options_df['delta'].to_numpy(dtype=float) >= -max_prob) &  # Delta between -max_prob and 0
+        (options_df['annualized_return'].to_numpy(dtype=float) >= criteria['min_annualized_return']) &
+        options_df['out_of_the_money'].to_numpy(dtype=bool)
     )
+    candidates = np.flatnonzero(mask)
+    if len(candidates) == 0:
+        return options_df.iloc[candidates]
     
-    return filtered.head(config['output']['max_results'])
+    # Rank candidates and keep the top max_results
+    ascending = output['sort_order'] == 'ascending'
+    keys = [_sort_key(options_df[col].to_numpy()[candidates], ascending) for col in output['sort_by']]
+    groups = None
+    if per_symbol:
+        groups, _ = pd.factorize(options_df['symbol'].to_numpy()[candidates])
+    
+    top = top_k_indices(keys, output['max_results'], groups)
+    return options_df.iloc[candidates[top]]
 
 def format_output(filtered_df, current_price=None):
     """Format the output DataFrame for display"""
@@ -311,27 +420,90 @@ def format_output(filtered_df, current_price=None):
     
     return formatted
 
+def prepare_universe(chains, prices):
+    """
+    Combine fetched chains into one frame and calculate metrics once.
+    
+    Args:
+        chains: Dict of symbol -> options chain DataFrame
+        prices: Dict of symbol -> current stock price
+        
+    Returns:
+        Single DataFrame for all symbols with current_price and metric columns
+    """
+    frames = [
+        chain for symbol, chain in chains.items()
+        if chain is not None and not chain.empty and prices.get(symbol) is not None
+    ]
+    if not frames:
+        return pd.DataFrame()
+    
+    universe = pd.concat(frames, ignore_index=True)
+    current_price = universe['symbol'].map(prices).to_numpy(dtype=float)
+    universe['current_price'] = current_price
+    
+    return calculate_metrics(universe, current_price)
+
+def screen_universe(universe, config):
+    """
+    Filter, rank and format a prepared universe in one pass.
+    
+    Returns:
+        Dict of symbol -> formatted DataFrame (symbols without results are omitted)
+    """
+    if universe.empty:
+        return {}
+    
+    filtered = screen_options(universe, config, per_symbol=True)
+    formatted = format_output(filtered)
+    if formatted.empty:
+        return {}
+    
+    return {
+        symbol: group.reset_index(drop=True)
+        for symbol, group in formatted.groupby('symbol', sort=False)
+    }
+
+def run_screening_pipeline(chains, prices, config):
+    """
+    Batch screening pipeline shared by the CLI, Streamlit app and backend.
+    
+    Runs metrics, filtering, ranking and formatting once over a single
+    concatenated frame instead of once per symbol.
+    
+    Args:
+        chains: Dict of symbol -> options chain DataFrame
+        prices: Dict of symbol -> current stock price
+        config: Configuration dictionary
+        
+    Returns:
+        Dict of symbol -> formatted DataFrame, in the order of chains
+    """
+    screened = screen_universe(prepare_universe(chains, prices), config)
+    return {symbol: screened[symbol] for symbol in chains if symbol in screened}
+
 def main(api_source="alpaca"):
     """Main function for command line execution"""
     config = load_config()
-    results = pd.DataFrame()
+    chains = {}
+    prices = {}
+    
+    # One bulk quote request for the watchlist; per-symbol lookups hit its cache
+    get_spot_prices(config['data']['symbols'])
     
     for symbol in config['data']['symbols']:
         try:
             print(f"Processing {symbol}...")
-            current_price = get_stock_price(symbol, api_source)
-            
-            options = get_options_chain(symbol, config, api_source)
-            if not options.empty:
-                options = calculate_metrics(options, current_price)
-                filtered = screen_options(options, config)
-                formatted = format_output(filtered, current_price)
-                results = pd.concat([results, formatted], ignore_index=True)
+            prices[symbol] = get_stock_price(symbol, api_source)
+            chains[symbol] = get_options_chain(symbol, config, api_source)
                 
         except Exception as e:
             print(f"Error processing {symbol}: {str(e)}")
     
-    if not results.empty:
+    screened = run_screening_pipeline(chains, prices, config)
+    
+    if screened:
+        results = pd.concat(screened.values(), ignore_index=True)
         print("\nTop Options Opportunities:")
         print(results.to_string(index=False))
     else:
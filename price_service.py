@@ -0,0 +1,225 @@
+"""
+Spot Price Service - Shared, batched stock prices from Yahoo Finance
+- Portions generated by AI
+
+Resolves spot prices for a whole watchlist with one yf.download request
+instead of one slow yf.Ticker(...).info lookup per symbol, and keeps them
+in memory so per-symbol callers (chain fetchers, Greeks back-fill) and
+concurrent users read from the same map:
+- Fresh (younger than SPOT_PRICE_TTL): served from memory
+- Stale (up to SPOT_PRICE_STALE seconds past the TTL): served immediately
+  while one background fetch refreshes it
+- Missing or older: fetched; concurrent callers for a symbol already being
+  fetched wait for that request instead of starting their own (single-flight)
+"""
+
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+import yfinance as yf
+
+# Seconds a fetched spot price is reused
+SPOT_PRICE_TTL = float(os.getenv("SPOT_PRICE_TTL", "30"))
+# Seconds past the TTL a price is still served while it is refreshed
+SPOT_PRICE_STALE = float(os.getenv("SPOT_PRICE_STALE", "120"))
+# Longest a caller waits on another caller's in-flight fetch
+SPOT_PRICE_WAIT = 30.0
+
+
+def _normalize(symbols: Iterable[str]):
+    """Upper-case, strip and de-duplicate symbols, keeping order"""
+    return list(dict.fromkeys(s.strip().upper() for s in symbols if s and s.strip()))
+
+
+def _last_closes(data: pd.DataFrame, symbols) -> Dict[str, float]:
+    """Latest non-NaN close per ticker from a yf.download frame"""
+    if data is None or data.empty or 'Close' not in data.columns.get_level_values(0):
+        return {}
+
+    closes = data['Close']
+    if isinstance(closes, pd.Series):
+        closes = closes.to_frame(symbols[0])
+
+    last = closes.ffill().iloc[-1]
+    return {
+        str(symbol).upper(): round(float(price), 2)
+        for symbol, price in last.items()
+        if pd.notna(price) and price > 0
+    }
+
+
+def download_spot_prices(symbols: Iterable[str]) -> Dict[str, float]:
+    """
+    Fetch spot prices for many symbols (no caching).
+
+    One yf.download call covers every symbol; symbols missing from the bulk
+    result are retried individually via the lightweight fast_info quote.
+
+    Returns:
+        Dict of symbol -> price (symbols without a price are omitted)
+    """
+    symbols = _normalize(symbols)
+    if not symbols:
+        return {}
+
+    prices = {}
+    try:
+        data = yf.download(
+            symbols, period='1d', interval='1m', progress=False,
+            threads=True, auto_adjust=False
+        )
+        prices = _last_closes(data, symbols)
+    except Exception as e:
+        print(f"Bulk Yahoo Finance download failed: {str(e)}")
+
+    for symbol in symbols:
+        if symbol in prices:
+            continue
+        try:
+            last_price = yf.Ticker(symbol).fast_info['last_price']
+            if last_price and last_price > 0:
+                prices[symbol] = round(float(last_price), 2)
+        except Exception as e:
+            print(f"Error getting Yahoo Finance quote for {symbol}: {str(e)}")
+
+    return prices
+
+
+class PriceService:
+    """
+    Process-wide spot price cache with request coalescing.
+
+    All lookups go through get_prices; one instance (price_service below)
+    is shared by every screener thread and user in the process.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None, stale_seconds: Optional[float] = None,
+                 fetcher: Optional[Callable[[List[str]], Dict[str, float]]] = None):
+        self.ttl_seconds = SPOT_PRICE_TTL if ttl_seconds is None else ttl_seconds
+        self.stale_seconds = SPOT_PRICE_STALE if stale_seconds is None else stale_seconds
+        self.fetcher = fetcher or download_spot_prices
+
+        self._prices: Dict[str, tuple] = {}          # symbol -> (fetched_at, price)
+        self._in_flight: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.upstream_requests = 0
+        self.upstream_symbols = 0
+
+    def get_prices(self, symbols: Iterable[str]) -> Dict[str, float]:
+        """
+        Get spot prices for a watchlist.
+
+        Returns:
+            Dict of symbol -> price (symbols without a price are omitted)
+        """
+        symbols = _normalize(symbols)
+        prices = {}
+        refresh, fetch, wait = [], [], []
+
+        with self._lock:
+            now = time.monotonic()
+            for symbol in symbols:
+                entry = self._prices.get(symbol)
+                age = now - entry[0] if entry is not None else None
+
+                if age is not None and age < self.ttl_seconds:
+                    self.hits += 1
+                    prices[symbol] = entry[1]
+                elif age is not None and age < self.ttl_seconds + self.stale_seconds:
+                    self.stale_hits += 1
+                    prices[symbol] = entry[1]
+                    if symbol not in self._in_flight:
+                        self._in_flight[symbol] = threading.Event()
+                        refresh.append(symbol)
+                elif symbol in self._in_flight:
+                    self.coalesced += 1
+                    wait.append((symbol, self._in_flight[symbol]))
+                else:
+                    self.misses += 1
+                    self._in_flight[symbol] = threading.Event()
+                    fetch.append(symbol)
+
+        if refresh:
+            threading.Thread(target=self._fetch, args=(refresh,), daemon=True).start()
+        if fetch:
+            prices.update(self._fetch(fetch))
+        for symbol, event in wait:
+            event.wait(SPOT_PRICE_WAIT)
+
+        if wait:
+            with self._lock:
+                for symbol, _ in wait:
+                    entry = self._prices.get(symbol)
+                    if entry is not None:
+                        prices[symbol] = entry[1]
+
+        return prices
+
+    def get_price(self, symbol: str) -> Optional[float]:
+        """Get one spot price"""
+        return self.get_prices([symbol]).get(symbol.strip().upper())
+
+    def _fetch(self, symbols: List[str]) -> Dict[str, float]:
+        """Fetch symbols this caller owns, store them and release any waiters"""
+        fetched = {}
+        try:
+            print(f"Fetching prices for {len(symbols)} symbols from Yahoo Finance (batch)...")
+            fetched = self.fetcher(symbols)
+        except Exception as e:
+            print(f"Error fetching spot prices: {str(e)}")
+        finally:
+            fetched_at = time.monotonic()
+            with self._lock:
+                self.upstream_requests += 1
+                self.upstream_symbols += len(symbols)
+                for symbol, price in fetched.items():
+                    self._prices[symbol] = (fetched_at, price)
+                for symbol in symbols:
+                    event = self._in_flight.pop(symbol, None)
+                    if event is not None:
+                        event.set()
+        return fetched
+
+    def clear(self):
+        """Drop all cached prices"""
+        with self._lock:
+            self._prices.clear()
+
+    def stats(self) -> Dict[str, object]:
+        """Counters for monitoring: coalesced = callers that waited on another fetch"""
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses + self.coalesced
+            return {
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'hit_ratio': round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+                'upstream_requests': self.upstream_requests,
+                'upstream_symbols': self.upstream_symbols,
+                'entries': len(self._prices),
+                'ttl_seconds': self.ttl_seconds,
+                'stale_seconds': self.stale_seconds,
+            }
+
+
+# Global instance shared by every caller in the process
+price_service = PriceService()
+
+
+def get_spot_prices(symbols: Iterable[str]) -> Dict[str, float]:
+    """Get spot prices for a watchlist from the shared price service"""
+    return price_service.get_prices(symbols)
+
+
+def get_spot_price(symbol: str) -> Optional[float]:
+    """Get one spot price from the shared price service"""
+    return price_service.get_price(symbol)
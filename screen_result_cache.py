@@ -0,0 +1,164 @@
+"""
+Screen Result Cache - Whole-screen result cache for identical requests
+- Portions generated by AI
+
+Most screens repeat the default settings on the same watchlist, and the
+underlying data only changes every RESULT_CACHE_WINDOW seconds (the 15-min
+data delay). Results are cached per (symbol set, criteria, epoch), where the
+epoch is the wall-clock window the request falls in, so every entry expires
+at the same boundary the pre-warm scheduler refreshes on.
+
+Identical screens running at the same time share one computation: the batch
+endpoint runs compute() through get_or_compute, and the streaming endpoint
+registers its own computation with begin() so later identical requests
+(batch or stream) join it instead of fetching again.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+RESULT_CACHE_ENABLED = os.getenv("RESULT_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+RESULT_CACHE_WINDOW = float(os.getenv("RESULT_CACHE_WINDOW", "900"))  # Seconds per data-refresh epoch
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "256"))  # Distinct screens kept
+
+
+class ScreenResultCache:
+    """
+    In-process LRU cache of screen results for identical requests.
+
+    Requests are pydantic models with a symbols list (backend ScreenRequest);
+    every other field counts as screening criteria. Concurrent identical
+    requests share one computation. Only non-empty results are stored, so a
+    failed upstream is retried on the next request.
+    """
+
+    def __init__(self, window_seconds: Optional[float] = None, max_entries: Optional[int] = None,
+                 enabled: Optional[bool] = None):
+        self.window_seconds = RESULT_CACHE_WINDOW if window_seconds is None else window_seconds
+        self.max_entries = RESULT_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self.enabled = RESULT_CACHE_ENABLED if enabled is None else enabled
+        self._entries = OrderedDict()  # (epoch, digest) -> (results, used_yahoo)
+        self._in_flight = {}  # (epoch, digest) -> asyncio.Future
+
+        self.hits = 0
+        self.coalesced = 0
+        self.misses = 0
+
+    def key(self, request, now: Optional[float] = None) -> tuple:
+        """Canonical (epoch, digest) for a request; symbol order and duplicates are ignored"""
+        criteria = request.model_dump(exclude={"symbols"})
+        canonical = json.dumps(
+            {"symbols": sorted(set(request.symbols)), "criteria": criteria},
+            sort_keys=True, separators=(",", ":")
+        )
+        epoch = int((time.time() if now is None else now) // self.window_seconds)
+        return epoch, hashlib.sha256(canonical.encode()).hexdigest()
+
+    def get(self, key: tuple):
+        """Return (results, used_yahoo) for a key, or None (counted as a miss)"""
+        if not self.enabled:
+            return None
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: tuple, results: dict, used_yahoo: bool) -> None:
+        """Store results; entries from earlier epochs are dropped"""
+        if not self.enabled or not results:
+            return
+        epoch = key[0]
+        for old_key in [k for k in self._entries if k[0] < epoch]:
+            del self._entries[old_key]
+        self._entries[key] = (results, used_yahoo)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def join(self, key: tuple) -> Optional[asyncio.Future]:
+        """
+        In-flight computation for a key that just missed get(), or None.
+        A joined lookup is counted as coalesced instead of missed.
+        """
+        future = self._in_flight.get(key) if self.enabled else None
+        if future is not None:
+            self.misses -= 1
+            self.coalesced += 1
+        return future
+
+    def begin(self, key: tuple) -> Optional[asyncio.Future]:
+        """
+        Register a computation the caller runs itself (the streaming endpoint).
+        Resolve the returned future with (results, used_yahoo) when done, or
+        cancel it if the computation is abandoned; joined waiters then
+        compute on their own. Returns None when the cache is disabled.
+        """
+        if not self.enabled:
+            return None
+        future = asyncio.get_running_loop().create_future()
+        self._register(key, future)
+        return future
+
+    async def get_or_compute(self, request, compute):
+        """
+        Return cached (results, used_yahoo) for the request, joining an
+        identical screen already in progress or running compute() otherwise.
+        Results are reordered to the request's symbol order.
+        """
+        if not self.enabled:
+            return await compute()
+
+        key = self.key(request)
+        entry = self.get(key)
+        if entry is None:
+            future = self.join(key)
+            if future is None:
+                future = asyncio.ensure_future(compute())
+                self._register(key, future)
+            try:
+                # Shielded: a disconnecting client must not cancel other waiters' screen
+                entry = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The joined stream was abandoned part way: start over
+                return await self.get_or_compute(request, compute)
+
+        results, used_yahoo = entry
+        return {symbol: results[symbol] for symbol in request.symbols if symbol in results}, used_yahoo
+
+    def _register(self, key: tuple, future: asyncio.Future) -> None:
+        self._in_flight[key] = future
+        future.add_done_callback(lambda done: self._finish(key, done))
+
+    def _finish(self, key: tuple, future: asyncio.Future) -> None:
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+        if not future.cancelled() and future.exception() is None:
+            self.put(key, *future.result())
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters; hit_ratio counts hits and coalesced requests"""
+        lookups = self.hits + self.coalesced + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "coalesced": self.coalesced,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+            "entries": len(self._entries),
+            "in_flight": len(self._in_flight),
+            "window_seconds": self.window_seconds,
+        }
+
+
+# Global instance for easy import
+screen_result_cache = ScreenResultCache()
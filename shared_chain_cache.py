@@ -0,0 +1,242 @@
+"""
+Shared Chain Cache - Memory-mapped Arrow chain cache for multi-worker deployments
+- Portions generated by AI
+
+With several uvicorn workers, the in-memory ChainCache gives every worker
+its own copy of every chain and its own upstream fetches. When
+SHARED_CHAIN_CACHE_DIR is set (ideally on tmpfs, e.g. /dev/shm/...), chains
+are instead stored once as uncompressed Arrow IPC files that every worker
+memory-maps:
+- Writes go to a temp file and are renamed into place, so a chain written by
+  one worker is visible to all others on their next lookup
+- Reads map the file (pages are shared through the OS page cache) and only
+  the requested DTE slice is materialized as a DataFrame
+- A per-chain file lock makes workers that miss at the same time wait for
+  the one already fetching, then read its result
+
+SharedChainCache has the same interface as ChainCache, so MassiveAPIClient
+uses it as a drop-in replacement. Requires pyarrow; file locks need a POSIX
+system (elsewhere locking is skipped).
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from chain_cache import (
+    DEFAULT_TTL_SECONDS, CHAIN_WINDOW_MIN_DTE, CHAIN_WINDOW_MAX_DTE, is_narrower, widen_window
+)
+
+SHARED_CHAIN_CACHE_DIR = os.getenv("SHARED_CHAIN_CACHE_DIR", "")
+
+
+def shared_cache_enabled() -> bool:
+    """True when SHARED_CHAIN_CACHE_DIR is set and pyarrow is installed"""
+    if SHARED_CHAIN_CACHE_DIR and not ARROW_AVAILABLE:
+        print("WARNING: SHARED_CHAIN_CACHE_DIR is set but pyarrow is not installed. "
+              "Using the per-process chain cache (pip install pyarrow).")
+    return bool(SHARED_CHAIN_CACHE_DIR) and ARROW_AVAILABLE
+
+
+class SharedChainCache:
+    """
+    TTL cache of options chains shared by all processes using the same directory.
+
+    One file per (symbol, contract_type): <root>/<contract_type>/<SYMBOL>.arrow,
+    with the fetch time and DTE window in the Arrow schema metadata.
+    Hit/miss counters are per process.
+    """
+
+    shared = True
+
+    def __init__(self, root: Optional[str] = None, ttl_seconds: Optional[float] = None):
+        self.root = SHARED_CHAIN_CACHE_DIR if root is None else root
+        self.ttl_seconds = DEFAULT_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def _path(self, symbol: str, contract_type: str, suffix: str = ".arrow") -> str:
+        return os.path.join(self.root, contract_type, f"{symbol.upper()}{suffix}")
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def fetch_window(self, min_dte: int, max_dte: int, symbol: Optional[str] = None,
+                     contract_type: str = 'put') -> Tuple[int, int]:
+        """DTE window to fetch, covering the chain's fresh shared window (see ChainCache.fetch_window)"""
+        return widen_window(min_dte, max_dte, self._fresh_window(symbol, contract_type) if symbol else None)
+
+    def _fresh_window(self, symbol: str, contract_type: str) -> Optional[Tuple[int, int]]:
+        """DTE window of the fresh shared entry for a chain, or None (reads only the schema)"""
+        try:
+            with pa.memory_map(self._path(symbol, contract_type), 'r') as source:
+                meta = pa.ipc.open_file(source).schema.metadata or {}
+        except (FileNotFoundError, pa.ArrowInvalid, OSError):
+            return None
+        if time.time() - float(meta.get(b'fetched_at', 0)) > self.ttl_seconds:
+            return None
+        return int(meta.get(b'min_dte', 0)), int(meta.get(b'max_dte', -1))
+
+    def get(self, symbol: str, min_dte: int, max_dte: int,
+            contract_type: str = 'put') -> Optional[pd.DataFrame]:
+        """
+        Return the shared chain sliced to [min_dte, max_dte], or None if there
+        is no fresh entry covering that window.
+        """
+        try:
+            with pa.memory_map(self._path(symbol, contract_type), 'r') as source:
+                # Zero-copy: the table's buffers point into the mapped file
+                table = pa.ipc.open_file(source).read_all()
+
+                meta = table.schema.metadata or {}
+                fetched_at = float(meta.get(b'fetched_at', 0))
+                window_min = int(meta.get(b'min_dte', 0))
+                window_max = int(meta.get(b'max_dte', -1))
+                if (time.time() - fetched_at > self.ttl_seconds
+                        or min_dte < window_min or max_dte > window_max):
+                    self._count(False)
+                    return None
+
+                # Only the requested slice is copied out of the mapping
+                dte = table.column('dte')
+                mask = pc.and_(pc.greater_equal(dte, min_dte), pc.less_equal(dte, max_dte))
+                df = table.filter(mask).replace_schema_metadata(None).to_pandas()
+        except (FileNotFoundError, pa.ArrowInvalid, OSError):
+            self._count(False)
+            return None
+
+        self._count(True)
+        return df
+
+    def put(self, symbol: str, df: pd.DataFrame, min_dte: int, max_dte: int,
+            contract_type: str = 'put', fetched_at: Optional[float] = None) -> None:
+        """
+        Publish a chain fetched over [min_dte, max_dte] to all processes.
+        
+        fetched_at is the Unix time the data was fetched (default: now).
+        """
+        if df is None or df.empty:
+            return
+
+        # A narrower chain never replaces a fresh wider one
+        window = self._fresh_window(symbol, contract_type)
+        if window is not None and is_narrower((min_dte, max_dte), window):
+            return
+
+        path = self._path(symbol, contract_type)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            b'fetched_at': str(time.time() if fetched_at is None else fetched_at).encode(),
+            b'min_dte': str(min_dte).encode(),
+            b'max_dte': str(max_dte).encode(),
+        })
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with pa.OSFile(tmp_path, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, path)
+            with self._lock:
+                self.writes += 1
+        except Exception as e:
+            print(f"Could not write shared chain cache entry for {symbol}: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @contextmanager
+    def fetch_lock(self, symbol: str, contract_type: str = 'put'):
+        """Hold an exclusive cross-process lock while fetching a chain"""
+        if fcntl is None:
+            yield
+            return
+
+        path = self._path(symbol, contract_type, suffix=".lock")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def clear(self) -> None:
+        """Remove all shared chains (affects every process)"""
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.endswith('.arrow'):
+                    os.remove(os.path.join(dirpath, name))
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters (this process) and shared storage usage"""
+        entries, nbytes = 0, 0
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.endswith('.arrow'):
+                    entries += 1
+                    nbytes += os.path.getsize(os.path.join(dirpath, name))
+
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'shared': True,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'writes': self.writes,
+                'entries': entries,
+                'bytes': nbytes,
+                'ttl_seconds': self.ttl_seconds,
+                'window_dte': [CHAIN_WINDOW_MIN_DTE, CHAIN_WINDOW_MAX_DTE],
+            }
+
+
+def try_acquire_leader(name: str, directory: Optional[str] = None):
+    """
+    Try to become the single process that runs a background job.
+
+    Takes a non-blocking exclusive lock on <directory>/<name>.leader. The lock
+    is held for as long as the returned file object stays open and is released
+    automatically if the process dies.
+
+    Returns:
+        Open lock file if this process is the leader (keep a reference to it),
+        otherwise None. Without file locking support every process is a leader.
+    """
+    directory = directory or SHARED_CHAIN_CACHE_DIR
+    if fcntl is None or not directory:
+        return open(os.devnull, 'w')
+
+    os.makedirs(directory, exist_ok=True)
+    lock_file = open(os.path.join(directory, f"{name}.leader"), 'a')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+    return lock_file
@@ -0,0 +1,182 @@
+"""
+Chain Snapshot Store - Persistent options chain snapshots in Parquet
+- Portions generated by AI
+
+Normalized chains are written to disk after every upstream fetch so that a
+restarted process (deploy, Streamlit rerun, uvicorn reload) can serve a
+still-fresh chain from disk instead of fetching it again.
+
+Layout (one file per fetch, partitioned by symbol / date / time):
+
+    CHAIN_SNAPSHOT_DIR/<source>/symbol=<SYMBOL>/date=<YYYY-MM-DD>/<HHMMSS>_<type>_<min>-<max>.parquet
+
+The file name carries the fetch time, contract type and DTE window, so
+lookups only list a directory and read one file. DTE values are relative to
+the snapshot date, so only today's partition is ever served.
+
+Disabled unless CHAIN_SNAPSHOT_DIR is set; requires pyarrow (optional).
+"""
+
+import os
+import re
+import shutil
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401 - pandas uses it for Parquet
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+from chain_cache import DATA_DELAY_SECONDS
+
+CHAIN_SNAPSHOT_DIR = os.getenv("CHAIN_SNAPSHOT_DIR", "")
+# Snapshots older than this are stale and trigger a fresh fetch
+CHAIN_SNAPSHOT_MAX_AGE = float(os.getenv("CHAIN_SNAPSHOT_MAX_AGE", DATA_DELAY_SECONDS))
+# Date partitions older than this are deleted
+CHAIN_SNAPSHOT_RETENTION_DAYS = int(os.getenv("CHAIN_SNAPSHOT_RETENTION_DAYS", "7"))
+
+_FILE_PATTERN = re.compile(r"^(\d{6})_(put|call)_(\d+)-(\d+)\.parquet$")
+
+
+class ChainSnapshotStore:
+    """
+    Read and write options chain snapshots as partitioned Parquet files.
+
+    load() returns the newest fresh snapshot whose DTE window covers the
+    request, sliced to that request, with its fetch time; save() writes atomically (temp file +
+    rename) so concurrent readers never see a partial file.
+    """
+
+    def __init__(self, root: Optional[str] = None, max_age_seconds: Optional[float] = None,
+                 retention_days: Optional[int] = None):
+        self.root = CHAIN_SNAPSHOT_DIR if root is None else root
+        self.max_age_seconds = CHAIN_SNAPSHOT_MAX_AGE if max_age_seconds is None else max_age_seconds
+        self.retention_days = CHAIN_SNAPSHOT_RETENTION_DAYS if retention_days is None else retention_days
+        self._lock = threading.Lock()
+        self._pruned_on = None
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+        if self.root and not PARQUET_AVAILABLE:
+            print("WARNING: CHAIN_SNAPSHOT_DIR is set but pyarrow is not installed. "
+                  "Chain snapshots disabled (pip install pyarrow).")
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.root) and PARQUET_AVAILABLE
+
+    def _partition(self, source: str, symbol: str, day) -> str:
+        return os.path.join(self.root, source, f"symbol={symbol.upper()}", f"date={day.isoformat()}")
+
+    def load(self, source: str, symbol: str, min_dte: int, max_dte: int,
+             contract_type: str = 'put') -> Optional[Tuple[pd.DataFrame, float]]:
+        """
+        Return the newest fresh snapshot covering [min_dte, max_dte], sliced
+        to that range, or None if there is none.
+        
+        Returns:
+            Tuple of (DataFrame, fetched_at) where fetched_at is the snapshot's
+            fetch time as a Unix timestamp, so caches can keep its original age
+        """
+        if not self.enabled:
+            return None
+
+        now = datetime.now()
+        partition = self._partition(source, symbol, now.date())
+        best = None
+        try:
+            names = os.listdir(partition)
+        except OSError:
+            names = []
+
+        for name in names:
+            match = _FILE_PATTERN.match(name)
+            if not match or match.group(2) != contract_type:
+                continue
+            window_min, window_max = int(match.group(3)), int(match.group(4))
+            if min_dte < window_min or max_dte > window_max:
+                continue
+            fetched_at = datetime.combine(now.date(), datetime.strptime(match.group(1), "%H%M%S").time())
+            if (now - fetched_at).total_seconds() > self.max_age_seconds:
+                continue
+            if best is None or fetched_at > best[0]:
+                best = (fetched_at, name)
+
+        if best is None:
+            self.misses += 1
+            return None
+
+        try:
+            df = pd.read_parquet(os.path.join(partition, best[1]))
+        except Exception as e:
+            print(f"Could not read chain snapshot {best[1]} for {symbol}: {str(e)}")
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        age = (now - best[0]).total_seconds()
+        print(f"Loaded {source} chain snapshot for {symbol} ({len(df)} contracts, {age:.0f}s old)")
+        dte = df['dte'].to_numpy()
+        return df[(dte >= min_dte) & (dte <= max_dte)].reset_index(drop=True), best[0].timestamp()
+
+    def save(self, source: str, symbol: str, df: pd.DataFrame, min_dte: int, max_dte: int,
+             contract_type: str = 'put') -> None:
+        """Persist a chain fetched over [min_dte, max_dte] (empty frames are skipped)"""
+        if not self.enabled or df is None or df.empty:
+            return
+
+        now = datetime.now()
+        partition = self._partition(source, symbol, now.date())
+        name = f"{now.strftime('%H%M%S')}_{contract_type}_{min_dte}-{max_dte}.parquet"
+        path = os.path.join(partition, name)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        try:
+            os.makedirs(partition, exist_ok=True)
+            df.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+            self.writes += 1
+        except Exception as e:
+            print(f"Could not write chain snapshot for {symbol}: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        self._prune(now.date())
+
+    def _prune(self, today) -> None:
+        """Delete date partitions past the retention window (at most once a day)"""
+        with self._lock:
+            if self._pruned_on == today:
+                return
+            self._pruned_on = today
+
+        cutoff = (today - timedelta(days=self.retention_days)).isoformat()
+        for dirpath, dirnames, _ in os.walk(self.root):
+            for dirname in list(dirnames):
+                if dirname.startswith("date=") and dirname[5:] < cutoff:
+                    shutil.rmtree(os.path.join(dirpath, dirname), ignore_errors=True)
+                    dirnames.remove(dirname)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/write counters"""
+        lookups = self.hits + self.misses
+        return {
+            'enabled': self.enabled,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+            'writes': self.writes,
+            'max_age_seconds': self.max_age_seconds,
+        }
+
+
+# Global instance for easy import
+snapshot_store = ChainSnapshotStore()
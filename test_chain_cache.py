@@ -0,0 +1,191 @@
+"""
+Tests for the options chain cache
+- Portions generated by AI
+
+Run with: python test_chain_cache.py
+Or with pytest: pytest test_chain_cache.py -v
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from chain_cache import ChainCache, SingleFlight
+
+
+def make_chain(symbol='AAPL', rows=10):
+    """Build a small options chain DataFrame with one row per DTE 0..rows-1"""
+    return pd.DataFrame({
+        'symbol': [symbol] * rows,
+        'strike': [100.0 + i for i in range(rows)],
+        'expiry': ['2030-01-18'] * rows,
+        'dte': list(range(rows)),
+        'lastPrice': [1.5] * rows,
+    })
+
+
+class TestChainCache(unittest.TestCase):
+    """Test cases for ChainCache class."""
+
+    def test_01_hit_and_miss_counters(self):
+        """Test that lookups are counted as hits and misses."""
+        cache = ChainCache(ttl_seconds=60)
+
+        self.assertIsNone(cache.get('AAPL', 0, 9))
+        cache.put('AAPL', make_chain(), 0, 9)
+        self.assertEqual(len(cache.get('AAPL', 0, 9)), 10)
+
+        stats = cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hit_ratio'], 0.5)
+
+    def test_02_entries_expire_after_ttl(self):
+        """Test that entries older than the TTL are not served."""
+        cache = ChainCache(ttl_seconds=0.05)
+        cache.put('AAPL', make_chain(), 0, 9)
+
+        time.sleep(0.1)
+
+        self.assertIsNone(cache.get('AAPL', 0, 9))
+        self.assertEqual(cache.stats()['entries'], 0)
+
+    def test_03_returned_frames_are_copies(self):
+        """Test that callers cannot modify the cached frame."""
+        cache = ChainCache(ttl_seconds=60)
+        cache.put('AAPL', make_chain(), 0, 9)
+
+        first = cache.get('AAPL', 0, 9)
+        first['annualized_return'] = 1.0
+
+        self.assertNotIn('annualized_return', cache.get('AAPL', 0, 9).columns)
+
+    def test_04_lru_eviction_respects_memory_budget(self):
+        """Test that least-recently-used chains are evicted when over budget."""
+        chain_bytes = int(make_chain().memory_usage(deep=True).sum())
+        cache = ChainCache(ttl_seconds=60, max_mb=(chain_bytes * 2.5) / (1024 * 1024))
+
+        cache.put('A', make_chain('A'), 0, 9)
+        cache.put('B', make_chain('B'), 0, 9)
+        cache.get('A', 0, 9)  # A is now most recently used
+        cache.put('C', make_chain('C'), 0, 9)
+
+        self.assertIsNotNone(cache.get('A', 0, 9))
+        self.assertIsNone(cache.get('B', 0, 9))
+        self.assertIsNotNone(cache.get('C', 0, 9))
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_05_empty_frames_are_not_cached(self):
+        """Test that failed (empty) fetches are retried instead of cached."""
+        cache = ChainCache(ttl_seconds=60)
+        cache.put('A', pd.DataFrame(), 0, 9)
+
+        self.assertIsNone(cache.get('A', 0, 9))
+
+    def test_06_narrower_window_is_sliced_from_cache(self):
+        """Test that a DTE range inside the cached window is served by slicing."""
+        cache = ChainCache(ttl_seconds=60)
+        cache.put('AAPL', make_chain(), 0, 9)
+
+        sliced = cache.get('AAPL', 3, 5)
+
+        self.assertEqual(sorted(sliced['dte']), [3, 4, 5])
+        self.assertEqual(cache.stats()['hits'], 1)
+
+    def test_07_wider_window_is_a_miss(self):
+        """Test that a DTE range outside the cached window triggers a fetch."""
+        cache = ChainCache(ttl_seconds=60)
+        cache.put('AAPL', make_chain(), 3, 5)
+
+        self.assertIsNone(cache.get('AAPL', 0, 9))
+        self.assertIsNone(cache.get('AAPL', 3, 5, contract_type='call'))
+        self.assertEqual(cache.stats()['misses'], 2)
+
+    def test_08_refresh_keeps_fresh_wider_window(self):
+        """Test that a narrower refresh neither narrows the fetch nor replaces a wider entry."""
+        cache = ChainCache(ttl_seconds=60)
+        cache.put('A', make_chain('A', rows=91), 0, 90)
+
+        # A pre-warm refresh of the default window fetches the cached window instead
+        self.assertEqual(cache.fetch_window(0, 60, 'A'), (0, 90))
+        self.assertEqual(cache.fetch_window(0, 60), (0, 60))
+
+        cache.put('A', make_chain('A', rows=61), 0, 60)
+        self.assertEqual(len(cache.get('A', 15, 90)), 76)
+
+        # Once the wider entry is stale, a narrower chain replaces it
+        expired = ChainCache(ttl_seconds=0.05)
+        expired.put('A', make_chain('A', rows=91), 0, 90)
+        time.sleep(0.1)
+        self.assertEqual(expired.fetch_window(0, 60, 'A'), (0, 60))
+        expired.put('A', make_chain('A', rows=61), 0, 60)
+        self.assertEqual(len(expired.get('A', 0, 60)), 61)
+
+    def test_09_fetched_at_keeps_original_age(self):
+        """Test that a chain stored with an earlier fetch time expires on its original schedule."""
+        cache = ChainCache(ttl_seconds=60)
+        cache.put('OLD', make_chain('OLD'), 0, 9, fetched_at=time.time() - 61)
+        cache.put('RECENT', make_chain('RECENT'), 0, 9, fetched_at=time.time() - 30)
+
+        self.assertIsNone(cache.get('OLD', 0, 9))
+        self.assertIsNotNone(cache.get('RECENT', 0, 9))
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Test cases for SingleFlight class."""
+
+    def test_01_concurrent_calls_share_one_execution(self):
+        """Test that callers arriving during a fetch receive its result."""
+        flights = SingleFlight()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.2)
+            return make_chain()
+
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            results = list(pool.map(lambda _: flights.do(('AAPL', 'put', 0, 60), fetch), range(6)))
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sum(shared for _, shared in results), 5)
+        self.assertTrue(all(len(df) == 10 for df, _ in results))
+        self.assertEqual(flights.stats()['coalesced'], 5)
+
+    def test_02_errors_reach_waiters_and_key_is_released(self):
+        """Test that a failed call raises for every waiter and the next call runs again."""
+        flights = SingleFlight()
+        started = threading.Event()
+        errors = []
+
+        def failing():
+            started.set()
+            time.sleep(0.1)
+            raise RuntimeError('upstream down')
+
+        def call():
+            try:
+                flights.do('AAPL', failing)
+            except RuntimeError as e:
+                errors.append(e)
+
+        leader = threading.Thread(target=call)
+        leader.start()
+        started.wait()
+        call()
+        leader.join()
+
+        self.assertEqual(len(errors), 2)
+        self.assertEqual(flights.do('AAPL', lambda: 'ok'), ('ok', False))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,117 @@
+"""
+Tests for the vectorized Black-Scholes Greeks
+- Portions generated by AI
+
+Run with: python test_greeks.py
+Or with pytest: pytest test_greeks.py -v
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from greeks import black_scholes_greeks, implied_volatility
+
+
+class TestBlackScholesGreeks(unittest.TestCase):
+    """Test cases for black_scholes_greeks."""
+
+    def test_01_textbook_prices(self):
+        """Test against the classic S=K=100, T=1, r=5%, vol=20% example."""
+        call = black_scholes_greeks(100, 100, 1.0, 0.2, r=0.05, q=0.0, option_type='call')
+        put = black_scholes_greeks(100, 100, 1.0, 0.2, r=0.05, q=0.0, option_type='put')
+
+        self.assertAlmostEqual(float(call['price']), 10.4506, places=4)
+        self.assertAlmostEqual(float(put['price']), 5.5735, places=4)
+        self.assertAlmostEqual(float(call['delta']), 0.6368, places=4)
+        self.assertAlmostEqual(float(put['delta']), -0.3632, places=4)
+
+    def test_02_put_call_parity(self):
+        """Test put-call parity with a dividend yield across a whole chain."""
+        S, r, q, T = 120.0, 0.04, 0.02, 0.25
+        K = np.linspace(80, 160, 41)
+        call = black_scholes_greeks(S, K, T, 0.35, r=r, q=q, option_type='call')
+        put = black_scholes_greeks(S, K, T, 0.35, r=r, q=q, option_type='put')
+
+        parity = S * np.exp(-q * T) - K * np.exp(-r * T)
+        np.testing.assert_allclose(call['price'] - put['price'], parity, atol=1e-10)
+
+    def test_03_greeks_match_finite_differences(self):
+        """Test that each Greek matches a bumped-price finite difference."""
+        S, K, T, sigma, r, q = 100.0, np.array([90.0, 100.0, 110.0]), 30 / 365, 0.45, 0.05, 0.01
+        base = black_scholes_greeks(S, K, T, sigma, r=r, q=q)
+
+        def price(**bumps):
+            args = dict(S=S, K=K, T=T, sigma=sigma, r=r, q=q)
+            args.update(bumps)
+            return black_scholes_greeks(**args)['price']
+
+        h = 1e-4
+        delta = (price(S=S + h) - price(S=S - h)) / (2 * h)
+        gamma = (price(S=S + h) - 2 * base['price'] + price(S=S - h)) / (h * h)
+        vega = (price(sigma=sigma + h) - price(sigma=sigma - h)) / (2 * h) / 100
+        rho = (price(r=r + h) - price(r=r - h)) / (2 * h) / 100
+        theta = -(price(T=T + h) - price(T=T - h)) / (2 * h) / 365
+
+        np.testing.assert_allclose(base['delta'], delta, rtol=1e-5)
+        np.testing.assert_allclose(base['gamma'], gamma, rtol=1e-3)
+        np.testing.assert_allclose(base['vega'], vega, rtol=1e-5)
+        np.testing.assert_allclose(base['rho'], rho, rtol=1e-5)
+        np.testing.assert_allclose(base['theta'], theta, rtol=1e-5)
+
+    def test_04_black76_matches_discounted_forward(self):
+        """Test that Black-76 equals Black-Scholes on the implied forward."""
+        S, r, T = 100.0, 0.05, 0.5
+        F = S * np.exp(r * T)
+        bs = black_scholes_greeks(S, 95.0, T, 0.3, r=r, q=0.0)
+        b76 = black_scholes_greeks(F, 95.0, T, 0.3, r=r, model='black76')
+
+        self.assertAlmostEqual(float(bs['price']), float(b76['price']), places=10)
+        self.assertAlmostEqual(float(b76['rho']), float(-T * b76['price'] / 100), places=12)
+
+    def test_05_invalid_inputs_are_nan(self):
+        """Test that zero vol, zero time or bad prices produce NaN instead of errors."""
+        result = black_scholes_greeks(100.0, [100.0, 100.0, 0.0], [0.0, 0.1, 0.1], [0.3, 0.0, 0.3])
+
+        for name, values in result.items():
+            self.assertTrue(np.isnan(values).all(), f"{name} should be NaN for invalid rows")
+
+
+class TestImpliedVolatility(unittest.TestCase):
+    """Test cases for implied_volatility."""
+
+    def test_01_round_trips_model_prices(self):
+        """Test that solved IVs reprice a whole chain of puts and calls."""
+        rng = np.random.default_rng(0)
+        K = rng.uniform(60, 160, 2000)
+        T = rng.integers(1, 120, 2000) / 365
+        sigma = rng.uniform(0.1, 1.5, 2000)
+
+        for option_type in ('put', 'call'):
+            model = black_scholes_greeks(100.0, K, T, sigma, option_type=option_type)
+            price = model['price']
+            iv = implied_volatility(price, 100.0, K, T, option_type=option_type)
+            repriced = black_scholes_greeks(100.0, K, T, iv, option_type=option_type)['price']
+
+            # Where vega is ~0 (deep ITM/OTM) many vols give the same price
+            informative = model['vega'] > 1e-3
+            self.assertTrue(np.isfinite(iv[informative]).all())
+            np.testing.assert_allclose(iv[informative], sigma[informative], rtol=1e-3)
+            np.testing.assert_allclose(repriced[price > 0], price[price > 0], atol=1e-6)
+
+    def test_02_unsolvable_prices_are_nan(self):
+        """Test that prices below intrinsic value or above the max-vol price are NaN."""
+        # Put K=120 on S=100 is worth at least ~20; a 5.00 last trade is stale
+        iv = implied_volatility([5.0, 150.0, 0.0, 2.0], 100.0, [120.0, 100.0, 100.0, 100.0],
+                                [0.1, 0.1, 0.1, 0.0])
+
+        self.assertTrue(np.isnan(iv).all())
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,391 @@
+"""
+Tests for the options screener: Yahoo chains, metrics, batch pipeline and ranking
+- Portions generated by AI
+
+Run with: python test_options_screener.py
+Or with pytest: pytest test_options_screener.py -v
+"""
+
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import options_screener
+from greeks import black_scholes_greeks, pricing_inputs
+from options_screener import (
+    calculate_metrics, format_output, prepare_universe, run_screening_pipeline,
+    screen_options, screen_universe, top_k_indices
+)
+
+
+def make_config(sort_by=('annualized_return',), sort_order='descending', max_results=3):
+    """Screening config that lets every out-of-the-money row through the filters"""
+    return {
+        'options_strategy': {'min_volume': 0, 'min_open_interest': 0},
+        'screening_criteria': {'min_annualized_return': 0, 'max_assignment_probability': 100},
+        'output': {'sort_by': list(sort_by), 'sort_order': sort_order, 'max_results': max_results},
+    }
+
+
+def make_candidates(symbols=('MSFT', 'AAPL', 'SPY'), rows=40, seed=0):
+    """Interleaved multi-symbol candidates with coarse (tie-heavy) sort columns and some NaNs"""
+    rng = np.random.default_rng(seed)
+    n = len(symbols) * rows
+    df = pd.DataFrame({
+        'symbol': rng.permutation(np.repeat(symbols, rows)),
+        'strike': np.round(rng.uniform(90, 110, n)),
+        'annualized_return': np.round(rng.uniform(20, 30, n)),
+        'volume': rng.integers(10, 100, n),
+        'open_interest': rng.integers(10, 100, n),
+        'delta': rng.uniform(-0.3, 0, n),
+        'out_of_the_money': True,
+    })
+    # NaNs in a sort column the filters do not drop
+    df.loc[rng.random(n) < 0.1, 'strike'] = np.nan
+    return df
+
+
+def reference(df, config, per_symbol=False):
+    """Expected result: a stable pandas sort (NaN last) and head()"""
+    output = config['output']
+    ordered = df.sort_values(output['sort_by'], ascending=output['sort_order'] == 'ascending',
+                             na_position='last', kind='stable')
+    if not per_symbol:
+        return ordered.head(output['max_results'])
+    top = ordered.groupby('symbol', sort=False).head(output['max_results'])
+    # screen_options groups symbols in order of first appearance
+    symbol_order = {symbol: i for i, symbol in enumerate(pd.unique(df['symbol']))}
+    return top.sort_values('symbol', key=lambda s: s.map(symbol_order), kind='stable')
+
+
+def make_chain(expiry_days=(0, 7, 30, 45), strikes=(90.0, 95.0, 100.0, 105.0)):
+    """Fixed put chain over several expiries (listed out of order), with NaN IV/delta rows"""
+    today = datetime.now().date()
+    rows = []
+    for days in reversed(expiry_days):
+        for strike in strikes:
+            rows.append({
+                'strike': strike,
+                'lastPrice': round(0.05 * strike / 100 * (1 + days / 10), 2),
+                'expiry': (today + timedelta(days=days)).strftime('%Y-%m-%d'),
+                'impliedVolatility': 0.3,
+                'delta': -0.25,
+            })
+    chain = pd.DataFrame(rows)
+    chain.loc[::3, 'impliedVolatility'] = np.nan
+    chain.loc[1::4, 'delta'] = np.nan
+    # An expiry that passed today still counts as one calendar day
+    chain.loc[len(chain)] = {'strike': 100.0, 'lastPrice': 0.01, 'impliedVolatility': np.nan,
+                             'delta': np.nan,
+                             'expiry': (today - timedelta(days=1)).strftime('%Y-%m-%d')}
+    return chain
+
+
+def reference_metrics(options_chain, current_price):
+    """Per-row calculate_metrics as it was before vectorization"""
+    options_chain['out_of_the_money'] = options_chain['strike'] < current_price
+    today = datetime.now().date()
+    options_chain['calendar_days'] = options_chain['expiry'].apply(
+        lambda x: max((datetime.strptime(x, '%Y-%m-%d').date() - today).days + 1, 1)
+    )
+    options_chain['annualized_return'] = (
+        options_chain['lastPrice'] / options_chain['strike'] * (365 / options_chain['calendar_days']) * 100
+    )
+    return options_chain
+
+
+class TestCalculateMetrics(unittest.TestCase):
+    """Test cases for calculate_metrics."""
+
+    def test_01_matches_per_row_implementation(self):
+        """Test equivalence with the per-row implementation across expiries and NaN rows."""
+        chain = make_chain()
+
+        result = calculate_metrics(chain.copy(), 100.0)
+        expected = reference_metrics(chain.copy(), 100.0)
+
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+        self.assertEqual(result['calendar_days'].min(), 1)
+        self.assertTrue(result['impliedVolatility'].isna().any())
+        self.assertTrue(result['delta'].isna().any())
+
+    def test_02_empty_chain(self):
+        """Test that an empty chain is returned unchanged."""
+        self.assertTrue(calculate_metrics(pd.DataFrame(), 100.0).empty)
+
+
+def make_symbol_chain(symbol, price, rows=30, seed=0):
+    """Raw put chain for one symbol, as returned by get_options_chain"""
+    rng = np.random.default_rng(seed)
+    today = datetime.now().date()
+    chain = pd.DataFrame({
+        'symbol': symbol,
+        'strike': np.round(rng.uniform(0.8, 1.1, rows) * price, 2),
+        'lastPrice': np.round(rng.uniform(0.1, 5.0, rows), 2),
+        'expiry': [(today + timedelta(days=int(d))).strftime('%Y-%m-%d')
+                   for d in rng.choice([14, 21, 35, 42], rows)],
+        'volume': rng.integers(0, 200, rows),
+        'open_interest': rng.integers(0, 500, rows),
+        'delta': rng.uniform(-0.6, 0, rows),
+        'theta': rng.uniform(-0.1, 0, rows),
+        'impliedVolatility': rng.uniform(0.2, 0.6, rows),
+    })
+    chain.loc[rng.random(rows) < 0.1, 'delta'] = np.nan
+    return chain
+
+
+def per_symbol_reference(chain, price, config):
+    """Expected result: the per-symbol calculate_metrics -> screen_options -> format_output path"""
+    filtered = screen_options(calculate_metrics(chain.copy(), price), config)
+    return format_output(filtered, price).reset_index(drop=True)
+
+
+class TestScreeningPipeline(unittest.TestCase):
+    """Test cases for prepare_universe, screen_universe and run_screening_pipeline."""
+
+    def setUp(self):
+        self.prices = {'AAA': 100.0, 'BBB': 50.0, 'CCC': 250.0, 'EMPTY': 80.0, 'NOPRICE': None}
+        self.chains = {
+            symbol: make_symbol_chain(symbol, price or 120.0, seed=i)
+            for i, (symbol, price) in enumerate(self.prices.items())
+        }
+        self.chains['EMPTY'] = pd.DataFrame()
+        self.config = make_config(max_results=4)
+        self.config['options_strategy'].update({'min_volume': 20, 'min_open_interest': 50})
+        self.config['screening_criteria'].update({'min_annualized_return': 5,
+                                                  'max_assignment_probability': 40})
+
+    def test_01_prepare_universe_skips_empty_and_unpriced(self):
+        """Test that empty chains and symbols without a price are left out of the universe."""
+        universe = prepare_universe(self.chains, self.prices)
+
+        self.assertEqual(list(pd.unique(universe['symbol'])), ['AAA', 'BBB', 'CCC'])
+        self.assertEqual(len(universe), 90)
+        for symbol in ('AAA', 'BBB', 'CCC'):
+            rows = universe[universe['symbol'] == symbol]
+            self.assertTrue((rows['current_price'] == self.prices[symbol]).all())
+            self.assertTrue((rows['out_of_the_money'] == (rows['strike'] < self.prices[symbol])).all())
+
+        self.assertTrue(prepare_universe({'EMPTY': pd.DataFrame()}, self.prices).empty)
+        self.assertEqual(screen_universe(pd.DataFrame(), self.config), {})
+
+    def test_02_matches_per_symbol_path(self):
+        """Test equivalence with screening each symbol on its own."""
+        for max_results in (1, 4, 100):
+            self.config['output']['max_results'] = max_results
+            results = run_screening_pipeline(self.chains, self.prices, self.config)
+
+            self.assertEqual(list(results), ['AAA', 'BBB', 'CCC'])
+            for symbol, result in results.items():
+                with self.subTest(symbol=symbol, max_results=max_results):
+                    expected = per_symbol_reference(self.chains[symbol], self.prices[symbol], self.config)
+                    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+    def test_03_top_k_per_symbol(self):
+        """Test that every symbol keeps its own max_results rows, not a shared limit."""
+        results = screen_universe(prepare_universe(self.chains, self.prices), self.config)
+
+        self.assertEqual({symbol: len(df) for symbol, df in results.items()},
+                         {'AAA': 4, 'BBB': 4, 'CCC': 4})
+        for df in results.values():
+            self.assertTrue(df['annualized_return'].is_monotonic_decreasing)
+
+    def test_04_symbols_without_candidates_are_omitted(self):
+        """Test that a symbol whose rows all fail the filters does not appear in the results."""
+        self.chains['BBB']['volume'] = 0
+
+        results = run_screening_pipeline(self.chains, self.prices, self.config)
+
+        self.assertEqual(list(results), ['AAA', 'CCC'])
+
+
+class StubTicker:
+    """yf.Ticker stand-in: puts for a fixed set of expiries, one of which fails"""
+
+    def __init__(self, expiry_days, failing_days=()):
+        today = datetime.now().date()
+        self.expiries = {(today + timedelta(days=d)).strftime('%Y-%m-%d'): d for d in expiry_days}
+        self.options = tuple(self.expiries)
+        self.failing = {date for date, d in self.expiries.items() if d in failing_days}
+
+    def option_chain(self, date):
+        if date in self.failing:
+            raise ConnectionError("expiry unavailable")
+        days = self.expiries[date]
+        strikes = np.arange(80.0, 105.0, 5.0)
+        puts = pd.DataFrame({
+            'contractSymbol': [f"TST{date}P{strike:g}" for strike in strikes],
+            'strike': strikes,
+            'lastPrice': np.round(0.02 * strikes * (1 + days / 30), 2),
+            'volume': 10 + days,
+            'openInterest': 100 + days,
+            'impliedVolatility': np.linspace(0.25, 0.45, len(strikes)),
+        })
+        return SimpleNamespace(puts=puts, calls=pd.DataFrame())
+
+
+def serial_yahoo_chain(stock, symbol, config, current_price):
+    """Expected result: one expiry at a time with per-expiry Greeks, as before batching"""
+    min_dte = config['options_strategy'].get('min_dte', 0)
+    max_dte = config['options_strategy']['max_dte']
+    r, q = pricing_inputs(config)
+    all_options = pd.DataFrame()
+    for date in stock.options:
+        dte = (pd.to_datetime(date) - datetime.now()).days
+        if not min_dte <= dte <= max_dte:
+            continue
+        try:
+            puts = stock.option_chain(date).puts
+        except Exception:
+            continue
+        puts['expiry'] = date
+        puts['dte'] = int(dte)
+        puts['symbol'] = symbol
+        greeks = black_scholes_greeks(S=current_price, K=puts['strike'].to_numpy(),
+                                      T=max(dte, 1) / 365, sigma=puts['impliedVolatility'].to_numpy(),
+                                      r=r, q=q, option_type='put')
+        for name in ('delta', 'gamma', 'theta', 'vega', 'rho'):
+            puts[name] = greeks[name]
+        puts['open_interest'] = puts['openInterest']
+        all_options = pd.concat([all_options, puts], ignore_index=True)
+    return all_options
+
+
+class TestYahooOptionsChain(unittest.TestCase):
+    """Test cases for get_options_chain_yahoo with yf.Ticker stubbed."""
+
+    def setUp(self):
+        self.config = {'options_strategy': {'min_dte': 10, 'max_dte': 45},
+                       'pricing': {'risk_free_rate': 0.05, 'dividend_yield': 0.0}}
+        # No network for the spot price, and no on-disk snapshots
+        for target, attr, value in ((options_screener, 'get_stock_price_yahoo', lambda symbol: 100.0),
+                                    (options_screener.snapshot_store, 'load', lambda *args: None),
+                                    (options_screener.snapshot_store, 'save', lambda *args: None)):
+            patcher = mock.patch.object(target, attr, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def fetch(self, stock):
+        with mock.patch.object(options_screener.yf, 'Ticker', return_value=stock):
+            return options_screener.get_options_chain_yahoo('TST', self.config)
+
+    def test_01_matches_serial_fetch(self):
+        """Test equivalence with the serial per-expiry fetch, skipping an expiry that raises."""
+        stock = StubTicker(expiry_days=(3, 12, 19, 26, 33, 60), failing_days=(19,))
+
+        chain = self.fetch(stock)
+        expected = serial_yahoo_chain(stock, 'TST', self.config, 100.0)
+
+        pd.testing.assert_frame_equal(chain, expected)
+        for column in ('symbol', 'expiry', 'dte', 'open_interest', 'volume',
+                       'delta', 'gamma', 'theta', 'vega', 'rho'):
+            self.assertIn(column, chain.columns)
+
+    def test_02_dte_filter_and_failed_expiry(self):
+        """Test that only expiries inside the DTE range are kept and a failing one is dropped."""
+        stock = StubTicker(expiry_days=(3, 12, 19, 26, 33, 60), failing_days=(19,))
+
+        chain = self.fetch(stock)
+
+        self.assertEqual(len(chain), 3 * 5)
+        self.assertTrue(chain['dte'].between(10, 45).all())
+        kept = {stock.expiries[date] for date in chain['expiry'].unique()}
+        self.assertEqual(kept, {12, 26, 33})
+
+    def test_03_put_greeks_are_sane(self):
+        """Test that computed put Greeks match the closed-form delta and have the right signs."""
+        from scipy.stats import norm
+
+        chain = self.fetch(StubTicker(expiry_days=(12, 26)))
+
+        S, K, sigma = 100.0, chain['strike'], chain['impliedVolatility']
+        T = chain['dte'] / 365
+        d1 = (np.log(S / K) + (0.05 + sigma ** 2 / 2) * T) / (sigma * np.sqrt(T))
+        np.testing.assert_allclose(chain['delta'], -norm.cdf(-d1), rtol=1e-9)
+        self.assertTrue(chain['delta'].between(-1, 0).all())
+        self.assertTrue((chain['gamma'] > 0).all())
+        self.assertTrue((chain['vega'] > 0).all())
+
+    def test_04_all_expiries_fail(self):
+        """Test that an empty frame is returned when no expiry can be fetched."""
+        chain = self.fetch(StubTicker(expiry_days=(12, 26), failing_days=(12, 26)))
+
+        self.assertTrue(chain.empty)
+        self.assertTrue(self.fetch(StubTicker(expiry_days=(3, 60))).empty)
+
+
+class TestTopKIndices(unittest.TestCase):
+    """Test cases for top_k_indices."""
+
+    def test_01_per_group_limits(self):
+        """Test that each group keeps at most k rows, and small groups keep all of theirs."""
+        keys = [np.array([5.0, 1.0, 4.0, 2.0, 3.0, 9.0, 8.0])]
+        groups = np.array([0, 0, 0, 0, 0, 1, 1])
+
+        top = top_k_indices(keys, 2, groups)
+
+        self.assertEqual(top.tolist(), [1, 3, 6, 5])
+
+    def test_02_nan_keys_sort_last(self):
+        """Test that NaN keys rank after every number, with and without groups."""
+        keys = [np.array([np.nan, 3.0, np.nan, 1.0, 2.0, np.nan])]
+        groups = np.array([0, 0, 0, 1, 1, 1])
+
+        self.assertEqual(top_k_indices(keys, 4).tolist(), [3, 4, 1, 0])
+        self.assertEqual(top_k_indices(keys, 2, groups).tolist(), [1, 0, 3, 4])
+
+    def test_03_ties_broken_by_secondary_keys(self):
+        """Test that rows tied on the k-th primary value are ranked by the next key."""
+        primary = np.array([1.0, 2.0, 2.0, 2.0, 1.0, 2.0, 2.0])
+        secondary = np.array([0.0, 3.0, 1.0, 2.0, 0.0, 5.0, 4.0])
+        groups = np.array([0, 0, 0, 0, 1, 1, 1])
+
+        self.assertEqual(top_k_indices([primary, secondary], 3).tolist(), [0, 4, 2])
+        self.assertEqual(top_k_indices([primary, secondary], 2, groups).tolist(), [0, 2, 4, 6])
+
+
+class TestScreenOptions(unittest.TestCase):
+    """Test cases for screen_options ranking."""
+
+    def test_01_matches_sort_values_head(self):
+        """Test equivalence with sort_values().head() across sort settings."""
+        df = make_candidates()
+        cases = [
+            (('annualized_return',), 'descending', 3),
+            (('annualized_return', 'strike'), 'descending', 5),
+            (('strike', 'annualized_return'), 'ascending', 4),
+            (('symbol', 'annualized_return'), 'descending', 7),
+            (('annualized_return',), 'descending', 500),
+        ]
+
+        for sort_by, sort_order, max_results in cases:
+            config = make_config(sort_by, sort_order, max_results)
+            for per_symbol in (False, True):
+                with self.subTest(sort_by=sort_by, sort_order=sort_order,
+                                  max_results=max_results, per_symbol=per_symbol):
+                    result = screen_options(df.copy(), config, per_symbol=per_symbol)
+                    expected = reference(df, config, per_symbol=per_symbol)
+
+                    self.assertEqual(result.index.tolist(), expected.index.tolist())
+
+    def test_02_per_symbol_limit(self):
+        """Test that per_symbol keeps max_results rows for every symbol."""
+        df = make_candidates()
+
+        result = screen_options(df, make_config(max_results=3), per_symbol=True)
+
+        self.assertEqual(result['symbol'].value_counts().to_dict(), {'MSFT': 3, 'AAPL': 3, 'SPY': 3})
+        self.assertEqual(len(screen_options(df, make_config(max_results=3))), 3)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
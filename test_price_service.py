@@ -0,0 +1,111 @@
+"""
+Tests for the shared spot price service
+- Portions generated by AI
+
+Run with: python test_price_service.py
+Or with pytest: pytest test_price_service.py -v
+"""
+
+import os
+import sys
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import price_service
+from price_service import PriceService
+
+
+def make_download(closes):
+    """Build a yf.download-style frame (Price x Ticker columns) from {symbol: [closes]}"""
+    frame = pd.DataFrame(closes, dtype=float)
+    frame.columns = pd.MultiIndex.from_product([['Close'], frame.columns], names=['Price', 'Ticker'])
+    return frame
+
+
+def counting_fetcher(calls, delay=0.0, price=100.0):
+    """Fetcher that records each upstream batch and prices every symbol"""
+    def fetch(symbols):
+        calls.append(list(symbols))
+        time.sleep(delay)
+        return {s: price for s in symbols}
+    return fetch
+
+
+class TestDownloadSpotPrices(unittest.TestCase):
+    """Test cases for download_spot_prices."""
+
+    def test_01_whole_watchlist_in_one_download(self):
+        """Test that all symbols are resolved by a single bulk request."""
+        data = make_download({'AAPL': [180.0, 181.25], 'MSFT': [410.0, np.nan]})
+
+        with mock.patch.object(price_service.yf, 'download', return_value=data) as download:
+            prices = price_service.download_spot_prices(['aapl', 'MSFT', 'AAPL'])
+
+        download.assert_called_once()
+        self.assertEqual(download.call_args[0][0], ['AAPL', 'MSFT'])
+        self.assertEqual(prices, {'AAPL': 181.25, 'MSFT': 410.0})
+
+
+class TestPriceService(unittest.TestCase):
+    """Test cases for PriceService class."""
+
+    def test_01_cached_symbols_are_not_refetched(self):
+        """Test that only symbols missing from the cache are requested."""
+        calls = []
+        service = PriceService(ttl_seconds=60, fetcher=counting_fetcher(calls))
+
+        service.get_prices(['AAPL', 'MSFT'])
+        self.assertEqual(service.get_price('aapl'), 100.0)
+        service.get_prices(['AAPL', 'SPY'])
+
+        self.assertEqual(calls, [['AAPL', 'MSFT'], ['SPY']])
+
+    def test_02_concurrent_callers_share_one_fetch(self):
+        """Test that overlapping watchlists requested at once hit upstream once per symbol."""
+        calls = []
+        service = PriceService(ttl_seconds=60, fetcher=counting_fetcher(calls, delay=0.2))
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda _: service.get_prices(['AAPL', 'MSFT']), range(8)))
+
+        self.assertEqual(sum(len(batch) for batch in calls), 2)
+        self.assertTrue(all(r == {'AAPL': 100.0, 'MSFT': 100.0} for r in results))
+        self.assertGreater(service.stats()['coalesced'], 0)
+
+    def test_03_stale_prices_served_while_refreshing(self):
+        """Test that an expired price is returned at once and refreshed in the background."""
+        calls = []
+        service = PriceService(ttl_seconds=0.3, stale_seconds=60, fetcher=counting_fetcher(calls))
+        service.get_prices(['AAPL'])
+        service.fetcher = counting_fetcher(calls, delay=0.1, price=101.0)
+
+        time.sleep(0.35)
+        self.assertEqual(service.get_price('AAPL'), 100.0)  # Stale value, no waiting
+
+        time.sleep(0.2)
+        self.assertEqual(service.get_price('AAPL'), 101.0)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(service.stats()['stale_hits'], 1)
+
+    def test_04_expired_past_stale_window_is_refetched(self):
+        """Test that prices older than TTL + stale window block on a new fetch."""
+        calls = []
+        service = PriceService(ttl_seconds=0, stale_seconds=0, fetcher=counting_fetcher(calls))
+
+        service.get_prices(['AAPL'])
+        service.get_prices(['AAPL'])
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(service.stats()['misses'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,143 @@
+"""
+Tests for the screen result cache
+- Portions generated by AI
+
+Run with: python test_screen_result_cache.py
+Or with pytest: pytest test_screen_result_cache.py -v
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+from typing import List
+
+from pydantic import BaseModel
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from screen_result_cache import ScreenResultCache
+
+
+class Request(BaseModel):
+    """Same shape as the backend ScreenRequest (symbols + criteria)"""
+    symbols: List[str]
+    min_dte: int = 15
+    max_dte: int = 45
+
+
+RESULTS = ({'AAA': ['row'], 'BBB': ['row']}, False)
+
+
+class TestScreenResultCache(unittest.TestCase):
+    """Test cases for ScreenResultCache class."""
+
+    def test_01_key_ignores_symbol_order_and_duplicates(self):
+        """Test that equivalent requests share a key and different criteria do not."""
+        cache = ScreenResultCache(window_seconds=900, enabled=True)
+        now = 1_000_000.0
+
+        key = cache.key(Request(symbols=['AAA', 'BBB']), now)
+
+        self.assertEqual(cache.key(Request(symbols=['BBB', 'AAA', 'BBB']), now), key)
+        self.assertNotEqual(cache.key(Request(symbols=['AAA', 'BBB'], max_dte=60), now), key)
+        self.assertNotEqual(cache.key(Request(symbols=['AAA']), now), key)
+
+    def test_02_epoch_rollover(self):
+        """Test that keys change at the window boundary and older epochs are dropped."""
+        cache = ScreenResultCache(window_seconds=900, enabled=True)
+        request = Request(symbols=['AAA', 'BBB'])
+        old_key = cache.key(request, 899.0)
+        new_key = cache.key(request, 900.0)
+
+        self.assertEqual(cache.key(request, 0.0), old_key)
+        self.assertNotEqual(new_key, old_key)
+
+        cache.put(old_key, *RESULTS)
+        self.assertEqual(cache.get(old_key), RESULTS)
+        self.assertIsNone(cache.get(new_key))
+
+        cache.put(new_key, *RESULTS)
+        self.assertEqual(cache.stats()['entries'], 1)
+        self.assertIsNone(cache.get(old_key))
+
+    def test_03_concurrent_requests_share_one_computation(self):
+        """Test that identical in-flight screens are computed once and reordered per request."""
+        cache = ScreenResultCache(window_seconds=900, enabled=True)
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return RESULTS
+
+        async def run():
+            return await asyncio.gather(
+                cache.get_or_compute(Request(symbols=['AAA', 'BBB']), compute),
+                cache.get_or_compute(Request(symbols=['BBB', 'AAA']), compute),
+                cache.get_or_compute(Request(symbols=['AAA', 'BBB']), compute),
+            )
+
+        first, reordered, _ = asyncio.run(run())
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(list(first[0]), ['AAA', 'BBB'])
+        self.assertEqual(list(reordered[0]), ['BBB', 'AAA'])
+        stats = cache.stats()
+        self.assertEqual((stats['misses'], stats['coalesced'], stats['in_flight']), (1, 2, 0))
+
+        asyncio.run(cache.get_or_compute(Request(symbols=['AAA', 'BBB']), compute))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.stats()['hits'], 1)
+
+    def test_04_requests_join_a_registered_stream(self):
+        """Test that requests wait on a stream's computation, and recompute if it is abandoned."""
+        cache = ScreenResultCache(window_seconds=900, enabled=True)
+        request = Request(symbols=['AAA', 'BBB'])
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            return RESULTS
+
+        async def stream(finish):
+            key = cache.key(request)
+            self.assertIsNone(cache.get(key))
+            self.assertIsNone(cache.join(key))
+            pending = cache.begin(key)
+            waiter = asyncio.ensure_future(cache.get_or_compute(request, compute))
+            await asyncio.sleep(0.01)
+            if finish:
+                pending.set_result(RESULTS)
+            else:
+                pending.cancel()
+            return await waiter
+
+        self.assertEqual(asyncio.run(stream(finish=True)), RESULTS)
+        self.assertEqual((len(calls), cache.stats()['coalesced']), (0, 1))
+
+        cache = ScreenResultCache(window_seconds=900, enabled=True)
+        self.assertEqual(asyncio.run(stream(finish=False)), RESULTS)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.stats()['entries'], 1)
+
+    def test_05_empty_results_are_not_stored(self):
+        """Test that a screen with no results (e.g. failed upstream) is retried next time."""
+        cache = ScreenResultCache(window_seconds=900, enabled=True)
+        request = Request(symbols=['AAA'])
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            return {}, False
+
+        asyncio.run(cache.get_or_compute(request, compute))
+        asyncio.run(cache.get_or_compute(request, compute))
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(cache.stats()['entries'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
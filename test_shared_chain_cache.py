@@ -0,0 +1,82 @@
+"""
+Tests for the shared memory-mapped chain cache
+- Portions generated by AI
+
+Run with: python test_shared_chain_cache.py
+Or with pytest: pytest test_shared_chain_cache.py -v
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from shared_chain_cache import ARROW_AVAILABLE, SharedChainCache, fcntl, try_acquire_leader
+from test_chain_cache import make_chain
+
+
+@unittest.skipUnless(ARROW_AVAILABLE, "pyarrow not installed")
+class TestSharedChainCache(unittest.TestCase):
+    """Test cases for SharedChainCache class."""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_01_visible_to_other_instances(self):
+        """Test that a chain written by one instance (worker) is read by another."""
+        writer = SharedChainCache(root=self.root, ttl_seconds=60)
+        reader = SharedChainCache(root=self.root, ttl_seconds=60)
+
+        self.assertIsNone(reader.get('AAPL', 0, 9))
+        writer.put('AAPL', make_chain(), 0, 9)
+
+        pd.testing.assert_frame_equal(reader.get('AAPL', 0, 9), make_chain(), check_dtype=False)
+        self.assertEqual(sorted(reader.get('AAPL', 3, 5)['dte']), [3, 4, 5])
+        self.assertEqual(reader.stats()['hits'], 2)
+        self.assertEqual(reader.stats()['entries'], 1)
+
+    def test_02_expired_or_narrower_entries_miss(self):
+        """Test TTL expiry and that a window outside the stored one is a miss."""
+        cache = SharedChainCache(root=self.root, ttl_seconds=60)
+        cache.put('AAPL', make_chain(), 3, 5)
+
+        self.assertIsNone(cache.get('AAPL', 0, 9))
+        self.assertIsNone(SharedChainCache(root=self.root, ttl_seconds=-1).get('AAPL', 3, 5))
+
+        cache.put('OLD', make_chain('OLD'), 0, 9, fetched_at=time.time() - 61)
+        self.assertIsNone(cache.get('OLD', 0, 9))
+
+    def test_03_refresh_keeps_fresh_wider_window(self):
+        """Test that a narrower refresh does not replace a fresh wider shared entry."""
+        cache = SharedChainCache(root=self.root, ttl_seconds=60)
+        cache.put('A', make_chain('A', rows=91), 0, 90)
+
+        self.assertEqual(cache.fetch_window(0, 60, 'A'), (0, 90))
+        cache.put('A', make_chain('A', rows=61), 0, 60)
+        self.assertEqual(len(cache.get('A', 15, 90)), 76)
+
+    @unittest.skipIf(fcntl is None, "file locks not supported")
+    def test_04_single_leader(self):
+        """Test that only one holder of the leader lock exists until it is released."""
+        leader = try_acquire_leader('prewarm', self.root)
+        self.assertIsNotNone(leader)
+        self.assertIsNone(try_acquire_leader('prewarm', self.root))
+
+        leader.close()
+        follower = try_acquire_leader('prewarm', self.root)
+        self.assertIsNotNone(follower)
+        follower.close()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,90 @@
+"""
+Tests for pipelined options chain snapshot pagination
+- Portions generated by AI
+
+Run with: python test_snapshot_pager.py
+Or with pytest: pytest test_snapshot_pager.py -v
+"""
+
+import json
+import os
+import sys
+import time
+import unittest
+from urllib.parse import parse_qs, urlparse
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from massive_api_client import iter_snapshot_pages, prefetch
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self.data = json.dumps(body).encode()
+
+
+class FakePagedClient:
+    """Mimics RESTClient's raw snapshot call and next_url follow-ups"""
+
+    def __init__(self, rows, delay=0.0):
+        self.rows = rows
+        self.delay = delay
+        self.requests = []
+
+    def _page(self, cursor, limit):
+        time.sleep(self.delay)
+        body = {'results': self.rows[cursor * limit:(cursor + 1) * limit]}
+        if (cursor + 1) * limit < len(self.rows):
+            body['next_url'] = f"https://api.massive.com/v3/snapshot/options/AAPL?cursor={cursor + 1}&limit={limit}"
+        return FakeResponse(body)
+
+    def list_snapshot_options_chain(self, symbol, params=None, raw=False):
+        self.requests.append(params)
+        return self._page(0, params['limit'])
+
+    def _get(self, path, params=None, raw=False):
+        self.requests.append(path)
+        query = parse_qs(urlparse(path).query)
+        return self._page(int(query['cursor'][0]), int(query['limit'][0]))
+
+
+class TestSnapshotPager(unittest.TestCase):
+    """Test cases for iter_snapshot_pages and prefetch."""
+
+    def test_01_pages_follow_next_url(self):
+        """Test that every page is returned in order with its fetch time."""
+        client = FakePagedClient(list(range(7)))
+
+        pages = list(iter_snapshot_pages(client, 'AAPL', {'limit': 3}))
+
+        self.assertEqual([results for results, _ in pages], [[0, 1, 2], [3, 4, 5], [6]])
+        self.assertTrue(all(seconds >= 0 for _, seconds in pages))
+        self.assertEqual(client.requests[1], '/v3/snapshot/options/AAPL?cursor=1&limit=3')
+
+    def test_02_prefetch_overlaps_fetching_and_parsing(self):
+        """Test that page fetches run while the consumer is busy with earlier pages."""
+        client = FakePagedClient(list(range(10)), delay=0.05)
+        started = time.perf_counter()
+
+        for _ in prefetch(iter_snapshot_pages(client, 'AAPL', {'limit': 2}), depth=2):
+            time.sleep(0.05)  # Parsing
+
+        # Sequential would take 5 fetches + 5 parses = 0.5s
+        self.assertLess(time.perf_counter() - started, 0.45)
+
+    def test_03_prefetch_reraises_source_errors(self):
+        """Test that an error in the pager thread surfaces in the consumer."""
+        def failing():
+            yield 1
+            raise RuntimeError('page 2 failed')
+
+        received = []
+        with self.assertRaises(RuntimeError):
+            for item in prefetch(failing(), depth=2):
+                received.append(item)
+        self.assertEqual(received, [1])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,77 @@
+"""
+Tests for the Parquet chain snapshot store
+- Portions generated by AI
+
+Run with: python test_snapshot_store.py
+Or with pytest: pytest test_snapshot_store.py -v
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from snapshot_store import ChainSnapshotStore, PARQUET_AVAILABLE
+from test_chain_cache import make_chain
+
+
+@unittest.skipUnless(PARQUET_AVAILABLE, "pyarrow not installed")
+class TestChainSnapshotStore(unittest.TestCase):
+    """Test cases for ChainSnapshotStore class."""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_01_round_trip_sliced_to_request(self):
+        """Test that a saved window is loaded back and sliced to the requested DTE range."""
+        store = ChainSnapshotStore(root=self.root, max_age_seconds=60)
+        store.save('massive', 'AAPL', make_chain(), 0, 9)
+
+        loaded, fetched_at = store.load('massive', 'AAPL', 3, 5)
+
+        self.assertEqual(sorted(loaded['dte']), [3, 4, 5])
+        pd.testing.assert_frame_equal(store.load('massive', 'AAPL', 0, 9)[0], make_chain())
+        # Fetch time comes from the file name (whole seconds)
+        self.assertLessEqual(time.time() - fetched_at, 2)
+
+    def test_02_partitioned_by_source_symbol_and_date(self):
+        """Test the on-disk layout and that other sources/types/windows miss."""
+        store = ChainSnapshotStore(root=self.root, max_age_seconds=60)
+        store.save('massive', 'AAPL', make_chain(), 3, 5)
+
+        partitions = os.listdir(os.path.join(self.root, 'massive', 'symbol=AAPL'))
+        self.assertEqual(len(partitions), 1)
+        self.assertTrue(partitions[0].startswith('date='))
+
+        self.assertIsNone(store.load('yahoo', 'AAPL', 3, 5))
+        self.assertIsNone(store.load('massive', 'AAPL', 3, 5, contract_type='call'))
+        self.assertIsNone(store.load('massive', 'AAPL', 0, 9))
+
+    def test_03_stale_snapshots_are_not_served(self):
+        """Test that snapshots older than max_age_seconds are ignored."""
+        store = ChainSnapshotStore(root=self.root, max_age_seconds=-1)
+        store.save('massive', 'AAPL', make_chain(), 0, 9)
+
+        self.assertIsNone(store.load('massive', 'AAPL', 0, 9))
+
+    def test_04_disabled_without_directory(self):
+        """Test that the store is a no-op when no directory is configured."""
+        store = ChainSnapshotStore(root='')
+        store.save('massive', 'AAPL', make_chain(), 0, 9)
+
+        self.assertFalse(store.enabled)
+        self.assertIsNone(store.load('massive', 'AAPL', 0, 9))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
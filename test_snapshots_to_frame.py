@@ -0,0 +1,144 @@
+"""
+Tests for building options chains from Massive.com snapshots, incl. Greeks back-fill
+- Portions generated by AI
+
+Run with: python test_snapshots_to_frame.py
+Or with pytest: pytest test_snapshots_to_frame.py -v
+"""
+
+import os
+import sys
+import unittest
+from datetime import date, timedelta
+
+import numpy as np
+from massive.rest.models.snapshot import OptionContractSnapshot
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from greeks import black_scholes_greeks, pricing_inputs
+from massive_api_client import CHAIN_COLUMNS, snapshots_to_frame
+
+TODAY = date.today()
+DTE = 30
+SPOT = 100.0
+SIGMA = 0.3
+
+
+def model(strike, option_type='put'):
+    """Black-Scholes price and Greeks at SIGMA, with the same inputs the back-fill uses"""
+    r, q = pricing_inputs()
+    return {name: float(value) for name, value in black_scholes_greeks(
+        SPOT, strike, DTE / 365, SIGMA, r=r, q=q, option_type=option_type).items()}
+
+
+def make_snapshot(strike, option_type='put', greeks=True, iv=True, price=None,
+                  underlying=True):
+    """One snapshot priced at SIGMA; greeks/iv/underlying can be left out like the API does"""
+    fair = model(strike, option_type)
+    raw = {
+        "details": {
+            "strike_price": strike,
+            "expiration_date": (TODAY + timedelta(days=DTE)).isoformat(),
+            "ticker": f"O:TST{option_type[0].upper()}{strike:g}",
+            "contract_type": option_type,
+        },
+        "open_interest": 100,
+        "day": {"volume": 10, "close": 0.0},
+        "last_trade": {"price": round(fair['price'], 4) if price is None else price},
+    }
+    if greeks:
+        raw["greeks"] = {name: fair[name] for name in ('delta', 'gamma', 'theta', 'vega')}
+    if iv:
+        raw["implied_volatility"] = SIGMA
+    if underlying:
+        raw["underlying_asset"] = {"price": SPOT, "ticker": "TST"}
+    return OptionContractSnapshot.from_dict(raw)
+
+
+def by_strike(df, strike):
+    return df[df['strike'] == strike].iloc[0]
+
+
+class TestSnapshotsToFrame(unittest.TestCase):
+    """Test cases for snapshots_to_frame and the Greeks back-fill."""
+
+    def test_01_api_greeks_are_kept(self):
+        """Test that contracts with API Greeks are tagged 'api' and keep the API values."""
+        df, counts = snapshots_to_frame([make_snapshot(90.0), make_snapshot(95.0)], 'TST', TODAY)
+
+        self.assertEqual(list(df.columns), CHAIN_COLUMNS)
+        self.assertEqual(df['greeks_source'].tolist(), ['api', 'api'])
+        self.assertEqual(counts, {'scanned': 2, 'recovered': 0, 'skipped_no_greeks': 0})
+        self.assertEqual(by_strike(df, 90.0)['delta'], model(90.0)['delta'])
+        self.assertEqual(by_strike(df, 90.0)['dte'], DTE)
+
+    def test_02_greeks_computed_from_api_iv(self):
+        """Test that contracts without Greeks get them from the API IV and are tagged 'computed'."""
+        snapshots = [make_snapshot(90.0), make_snapshot(95.0, greeks=False),
+                     make_snapshot(105.0, greeks=False)]
+
+        df, counts = snapshots_to_frame(snapshots, 'TST', TODAY)
+
+        self.assertEqual(df['greeks_source'].tolist(), ['api', 'computed', 'computed'])
+        self.assertEqual(counts['recovered'], 2)
+        for strike in (95.0, 105.0):
+            row, expected = by_strike(df, strike), model(strike)
+            self.assertEqual(row['impliedVolatility'], SIGMA)
+            for name in ('delta', 'gamma', 'theta', 'vega'):
+                self.assertAlmostEqual(row[name], expected[name], places=10)
+        self.assertTrue(df['delta'].between(-1, 0).all())
+        # Deeper in the money puts have deltas closer to -1
+        self.assertLess(by_strike(df, 105.0)['delta'], by_strike(df, 95.0)['delta'])
+
+    def test_03_iv_and_greeks_solved_from_price(self):
+        """Test that contracts without IV or Greeks recover both from the option price."""
+        snapshots = [make_snapshot(strike, option_type, greeks=False, iv=False)
+                     for strike, option_type in ((90.0, 'put'), (100.0, 'put'), (110.0, 'call'))]
+
+        df, counts = snapshots_to_frame(snapshots, 'TST', TODAY)
+
+        self.assertEqual(counts, {'scanned': 3, 'recovered': 3, 'skipped_no_greeks': 0})
+        self.assertTrue((df['greeks_source'] == 'computed').all())
+        np.testing.assert_allclose(df['impliedVolatility'], SIGMA, atol=1e-3)
+        for strike, option_type in ((90.0, 'put'), (100.0, 'put'), (110.0, 'call')):
+            self.assertAlmostEqual(by_strike(df, strike)['delta'], model(strike, option_type)['delta'],
+                                   places=3)
+        puts, calls = df[df['strike'] < 105], df[df['strike'] > 105]
+        self.assertTrue(puts['delta'].between(-1, 0).all())
+        self.assertTrue(calls['delta'].between(0, 1).all())
+
+    def test_04_spot_price_fallback(self):
+        """Test that spot_price_fn is used when snapshots carry no underlying price."""
+        calls = []
+
+        def spot_price_fn():
+            calls.append(1)
+            return SPOT
+
+        snapshots = [make_snapshot(95.0, greeks=False, iv=False, underlying=False)]
+        df, _ = snapshots_to_frame(snapshots, 'TST', TODAY, spot_price_fn=spot_price_fn)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(df['greeks_source'].tolist(), ['computed'])
+        self.assertAlmostEqual(df['delta'].iloc[0], model(95.0)['delta'], places=3)
+
+    def test_05_unrecoverable_rows_are_dropped(self):
+        """Test that prices below intrinsic value and a disabled back-fill drop the row."""
+        snapshots = [make_snapshot(90.0),
+                     make_snapshot(120.0, greeks=False, iv=False, price=5.0),   # Below intrinsic (20)
+                     make_snapshot(95.0, greeks=False, iv=False, price=0.0)]    # No price at all
+
+        df, counts = snapshots_to_frame(snapshots, 'TST', TODAY)
+        self.assertEqual(df['strike'].tolist(), [90.0])
+        self.assertEqual(counts, {'scanned': 3, 'recovered': 0, 'skipped_no_greeks': 2})
+
+        df, counts = snapshots_to_frame([make_snapshot(90.0), make_snapshot(95.0, greeks=False)],
+                                        'TST', TODAY, backfill=False)
+        self.assertEqual(df['greeks_source'].tolist(), ['api'])
+        self.assertEqual(counts['skipped_no_greeks'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,99 @@
+"""
+Tests for the local-mode session universe cache
+- Portions generated by AI
+
+Run with: python test_universe_cache.py
+Or with pytest: pytest test_universe_cache.py -v
+"""
+
+import os
+import sys
+import unittest
+
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from universe_cache import UniverseCache
+
+NOW = 1_000_000.0
+
+
+def make_universe(symbols, dtes=range(10, 61, 10)):
+    """Prepared universe with one row per symbol and DTE"""
+    return pd.DataFrame([
+        {'symbol': symbol, 'dte': dte, 'strike': 100.0, 'annualized_return': 25.0}
+        for symbol in symbols for dte in dtes
+    ])
+
+
+class TestUniverseCache(unittest.TestCase):
+    """Test cases for UniverseCache class."""
+
+    def test_01_symbol_without_chain_stays_covered(self):
+        """Test that a symbol with no chain does not force a refetch of the watchlist."""
+        cache = UniverseCache(max_age_seconds=900)
+        cache.add(make_universe(['AAA', 'BBB']), fetched=['AAA', 'BBB', 'NONE'], failed=[],
+                  yahoo_symbols=[], min_dte=15, max_dte=45, now=NOW)
+
+        universe, missing, _, age = cache.lookup(['AAA', 'NONE', 'BBB'], 15, 45, now=NOW + 60)
+
+        self.assertEqual(missing, [])
+        self.assertEqual(age, 60)
+        self.assertEqual(cache.no_chain, {'NONE'})
+        self.assertEqual(sorted(universe['symbol'].unique()), ['AAA', 'BBB'])
+        self.assertTrue(universe['dte'].between(15, 45).all())
+
+    def test_02_only_missing_or_failed_symbols_are_fetched(self):
+        """Test that new and failed symbols are refetched, and nothing else."""
+        cache = UniverseCache(max_age_seconds=900)
+        cache.add(make_universe(['AAA']), fetched=['AAA'], failed=['ERR'],
+                  yahoo_symbols=[], min_dte=15, max_dte=45, now=NOW)
+
+        _, missing, _, _ = cache.lookup(['AAA', 'ERR', 'NEW'], 20, 30, now=NOW)
+        self.assertEqual(missing, ['ERR', 'NEW'])
+        self.assertEqual(cache.failed, {'ERR'})
+
+        # Missing symbols are fetched over the cached window, then served with the rest
+        self.assertEqual(cache.fetch_window(20, 30, now=NOW), (15, 45))
+        cache.add(make_universe(['ERR', 'NEW']), fetched=['ERR', 'NEW'], failed=[],
+                  yahoo_symbols=[], min_dte=20, max_dte=30, now=NOW + 10)
+
+        universe, missing, _, age = cache.lookup(['AAA', 'ERR', 'NEW'], 15, 45, now=NOW + 10)
+        self.assertEqual(missing, [])
+        self.assertEqual(cache.failed, set())
+        self.assertEqual(sorted(universe['symbol'].unique()), ['AAA', 'ERR', 'NEW'])
+        # The cache keeps the age of its oldest data
+        self.assertEqual(age, 10)
+
+    def test_03_used_yahoo_is_scoped_to_served_symbols(self):
+        """Test that the Yahoo flag only reflects symbols served from the cache."""
+        cache = UniverseCache(max_age_seconds=900)
+        cache.add(make_universe(['AAA', 'YHO']), fetched=['AAA', 'YHO'], failed=[],
+                  yahoo_symbols=['YHO'], min_dte=15, max_dte=45, now=NOW)
+
+        self.assertFalse(cache.lookup(['AAA'], 15, 45, now=NOW)[2])
+        self.assertTrue(cache.lookup(['AAA', 'YHO'], 15, 45, now=NOW)[2])
+
+    def test_04_expired_or_wider_requests_refetch_everything(self):
+        """Test that stale data or a widened DTE range misses for every symbol."""
+        cache = UniverseCache(max_age_seconds=900)
+        cache.add(make_universe(['AAA']), fetched=['AAA'], failed=[],
+                  yahoo_symbols=[], min_dte=15, max_dte=45, now=NOW)
+
+        self.assertEqual(cache.lookup(['AAA'], 15, 45, now=NOW + 901)[1], ['AAA'])
+        self.assertEqual(cache.lookup(['AAA'], 15, 60, now=NOW)[1], ['AAA'])
+        self.assertEqual(cache.fetch_window(15, 60, now=NOW), (15, 60))
+
+    def test_05_empty_universe_is_not_cached(self):
+        """Test that a fetch with no usable chains at all is retried next time."""
+        cache = UniverseCache(max_age_seconds=900)
+        cache.add(pd.DataFrame(), fetched=['AAA', 'BBB'], failed=[],
+                  yahoo_symbols=[], min_dte=15, max_dte=45, now=NOW)
+
+        self.assertEqual(cache.lookup(['AAA', 'BBB'], 15, 45, now=NOW)[1], ['AAA', 'BBB'])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
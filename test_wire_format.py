@@ -0,0 +1,161 @@
+"""
+Tests for the compact screen response encodings
+- Portions generated by AI
+
+Run with: python test_wire_format.py
+Or with pytest: pytest test_wire_format.py -v
+"""
+
+import json
+import os
+import sys
+import unittest
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import wire_format
+from wire_format import (
+    ARROW_STREAM, COLUMNAR_JSON, COLUMNAR_MSGPACK, COLUMNAR_NDJSON, JSON, NDJSON,
+    accept_header, available_formats, decode_screen_response, decode_stream_event, dumps_json,
+    encode_screen_response, frame_rows, negotiate, negotiate_stream, stream_accept_header, stream_results
+)
+
+META = {"success": True, "screens_remaining": 3, "used_yahoo_fallback": False, "message": "ok"}
+
+
+def make_results():
+    """Formatted screen results for two symbols, in non-alphabetical order"""
+    def formatted(symbol, n, price):
+        return pd.DataFrame({
+            'symbol': [symbol] * n,
+            'current_price': [price] * n,
+            'strike': price - np.arange(n, dtype=float),
+            'annualized_return': np.round(np.linspace(40, 20, n), 2),
+            'expiry': ['2026-11-20'] * n,
+            'calendar_days': np.full(n, 35, dtype=np.int64),
+            'volume': np.arange(n, dtype=np.int64) + 10,
+        })
+    return {'MSFT': formatted('MSFT', 3, 410.0), 'AAPL': formatted('AAPL', 2, 230.0)}
+
+
+class TestWireFormat(unittest.TestCase):
+    """Test cases for screen response negotiation and encoding."""
+
+    def test_01_columnar_formats_round_trip(self):
+        """Test that every compact format decodes to the original frames and metadata."""
+        results = make_results()
+
+        for media_type in [f for f in available_formats() if f != JSON]:
+            with self.subTest(media_type=media_type):
+                body = encode_screen_response(results, META, media_type)
+                decoded, meta = decode_screen_response(body, media_type)
+
+                self.assertEqual(list(decoded), ['MSFT', 'AAPL'])
+                for symbol, df in results.items():
+                    pd.testing.assert_frame_equal(decoded[symbol], df, check_dtype=False)
+                self.assertEqual(meta, META)
+
+    def test_02_columnar_json_is_smaller_than_records(self):
+        """Test that column arrays avoid repeating column names per row."""
+        results = make_results()
+        records = json.dumps({**META, "results": {s: df.to_dict(orient='records') for s, df in results.items()}})
+        columnar = encode_screen_response(results, META, COLUMNAR_JSON)
+
+        self.assertLess(len(columnar), len(records))
+
+        # Plain JSON responses decode through the same function
+        decoded, meta = decode_screen_response(records.encode(), "application/json; charset=utf-8")
+        pd.testing.assert_frame_equal(decoded['AAPL'], results['AAPL'], check_dtype=False)
+        self.assertEqual(meta['screens_remaining'], 3)
+
+    def test_03_negotiation(self):
+        """Test Accept parsing, q-values and the plain JSON default."""
+        self.assertEqual(negotiate(None), JSON)
+        self.assertEqual(negotiate("*/*"), JSON)
+        self.assertEqual(negotiate("text/html, application/xml"), JSON)
+        self.assertEqual(negotiate(f"{JSON};q=0.5, {COLUMNAR_JSON}"), COLUMNAR_JSON)
+        self.assertEqual(negotiate(f"{COLUMNAR_JSON};q=0.2, {JSON};q=0.9"), JSON)
+        self.assertEqual(negotiate(accept_header()), available_formats()[0])
+
+    def test_04_unavailable_formats_fall_back(self):
+        """Test that formats missing on the server are skipped during negotiation."""
+        arrow, msgpack = wire_format.ARROW_AVAILABLE, wire_format.MSGPACK_AVAILABLE
+        try:
+            wire_format.ARROW_AVAILABLE = wire_format.MSGPACK_AVAILABLE = False
+            self.assertEqual(
+                negotiate(f"{ARROW_STREAM}, {COLUMNAR_MSGPACK};q=0.9, {COLUMNAR_JSON};q=0.8"),
+                COLUMNAR_JSON
+            )
+        finally:
+            wire_format.ARROW_AVAILABLE, wire_format.MSGPACK_AVAILABLE = arrow, msgpack
+
+    def test_05_missing_values_encode_as_null(self):
+        """Test that NaN values survive columnar JSON as null instead of invalid JSON."""
+        results = make_results()
+        results['AAPL'].loc[1, 'annualized_return'] = np.nan
+
+        body = encode_screen_response(results, META, COLUMNAR_JSON)
+        decoded, _ = decode_screen_response(body, COLUMNAR_JSON)
+
+        self.assertIn(b'null', body)
+        self.assertTrue(np.isnan(decoded['AAPL'].loc[1, 'annualized_return']))
+
+    def test_06_row_json_matches_records_with_either_encoder(self):
+        """Test that frame_rows + dumps_json equals to_dict records, with orjson or stdlib."""
+        results = make_results()
+        results['AAPL'].loc[0, 'strike'] = np.nan
+        expected = {
+            symbol: df.astype(object).where(df.notna(), None).to_dict(orient='records')
+            for symbol, df in results.items()
+        }
+        payload = {"results": {symbol: frame_rows(df) for symbol, df in results.items()},
+                   "count": np.int64(5), "as_of": date(2026, 1, 2)}
+
+        orjson_available = wire_format.ORJSON_AVAILABLE
+        try:
+            for use_orjson in {False, orjson_available}:
+                with self.subTest(orjson=use_orjson):
+                    wire_format.ORJSON_AVAILABLE = use_orjson
+                    body = json.loads(dumps_json(payload))
+
+                    self.assertEqual(body['results'], expected)
+                    self.assertEqual(body['count'], 5)
+                    self.assertEqual(body['as_of'], '2026-01-02')
+        finally:
+            wire_format.ORJSON_AVAILABLE = orjson_available
+
+    def test_07_stream_events_decode_in_either_form(self):
+        """Test that the client's stream Accept gets columnar events and both forms decode alike."""
+        results = make_results()
+        results['AAPL'].loc[1, 'strike'] = np.nan
+
+        self.assertEqual(negotiate_stream(stream_accept_header()), COLUMNAR_NDJSON)
+        self.assertEqual(negotiate_stream(None), NDJSON)
+        self.assertEqual(negotiate_stream(accept_header()), NDJSON)
+
+        sizes = {}
+        for media_type in (COLUMNAR_NDJSON, NDJSON):
+            with self.subTest(media_type=media_type):
+                sizes[media_type] = 0
+                for symbol, df in [*results.items(), ('SPY', None)]:
+                    line = dumps_json({"type": "symbol", "symbol": symbol,
+                                       "results": stream_results(df, media_type)})
+                    sizes[media_type] += len(line)
+                    event = decode_stream_event(line)
+
+                    if df is None:
+                        self.assertTrue(event['results'].empty)
+                    else:
+                        pd.testing.assert_frame_equal(event['results'], df, check_dtype=False)
+
+        self.assertLess(sizes[COLUMNAR_NDJSON], sizes[NDJSON])
+        self.assertEqual(decode_stream_event(b'{"type":"summary","symbols":2}')['symbols'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
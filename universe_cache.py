@@ -0,0 +1,120 @@
+"""
+Universe Cache - Local-mode session cache of prepared options chains
+- Portions generated by AI
+
+The Streamlit app in local mode keeps the chains it fetched (after
+prepare_universe) so that changing only the screening thresholds re-screens
+them in memory instead of fetching again. Coverage is tracked per symbol:
+- covered: fetched successfully, whether or not a usable chain came back
+  (a symbol with no puts in the DTE window is not refetched on every screen)
+- failed: the fetch raised; these are fetched again on the next screen
+A screen that adds symbols only fetches the ones not covered yet. Everything
+is refetched once the data is older than UNIVERSE_MAX_AGE or the DTE range
+widens past the cached window.
+"""
+
+import os
+import time
+from typing import Iterable, List, Optional, Set, Tuple
+
+import pandas as pd
+
+# Seconds fetched chains are reused for criteria-only re-screens
+UNIVERSE_MAX_AGE = float(os.getenv("UNIVERSE_MAX_AGE", "900"))
+
+
+class UniverseCache:
+    """
+    Prepared chains for the symbols fetched since the last full fetch.
+
+    lookup() says which requested symbols can be served from memory and which
+    still need fetching; add() records a fetch made over fetch_window().
+    """
+
+    def __init__(self, max_age_seconds: Optional[float] = None):
+        self.max_age_seconds = UNIVERSE_MAX_AGE if max_age_seconds is None else max_age_seconds
+        self._reset(None, None, None)
+
+    def _reset(self, min_dte, max_dte, fetched_at) -> None:
+        self.frame = pd.DataFrame()
+        self.covered: Set[str] = set()
+        self.failed: Set[str] = set()
+        self.yahoo_symbols: Set[str] = set()
+        self.min_dte = min_dte
+        self.max_dte = max_dte
+        self.fetched_at = fetched_at
+
+    @property
+    def no_chain(self) -> Set[str]:
+        """Covered symbols that returned no chain (or no spot price)"""
+        if self.frame.empty:
+            return set(self.covered)
+        return self.covered - set(self.frame['symbol'].unique())
+
+    def _valid(self, min_dte: int, max_dte: int, now: float) -> bool:
+        """True if the cache is fresh and its DTE window covers [min_dte, max_dte]"""
+        return (self.fetched_at is not None
+                and now - self.fetched_at <= self.max_age_seconds
+                and self.min_dte <= min_dte and max_dte <= self.max_dte)
+
+    def fetch_window(self, min_dte: int, max_dte: int, now: Optional[float] = None) -> Tuple[int, int]:
+        """DTE window to fetch missing symbols over, so they can join the cached ones"""
+        now = time.time() if now is None else now
+        if self._valid(min_dte, max_dte, now):
+            return self.min_dte, self.max_dte
+        return min_dte, max_dte
+
+    def lookup(self, symbols: Iterable[str], min_dte: int, max_dte: int,
+               now: Optional[float] = None) -> Tuple[pd.DataFrame, List[str], bool, Optional[float]]:
+        """
+        Split a screen into what memory can answer and what must be fetched.
+
+        Returns:
+            Tuple of (cached universe sliced to the covered requested symbols
+            and the DTE range, symbols still to fetch in request order,
+            used_yahoo for the symbols served from memory, age in seconds or
+            None when nothing could be served)
+        """
+        now = time.time() if now is None else now
+        symbols = list(dict.fromkeys(symbols))
+        if not self._valid(min_dte, max_dte, now):
+            return pd.DataFrame(), symbols, False, None
+
+        missing = [symbol for symbol in symbols if symbol not in self.covered]
+        served = set(symbols) & self.covered
+
+        universe = self.frame
+        if not universe.empty:
+            mask = universe['symbol'].isin(served) & universe['dte'].between(min_dte, max_dte)
+            universe = universe[mask].reset_index(drop=True)
+        return universe, missing, bool(self.yahoo_symbols & served), now - self.fetched_at
+
+    def add(self, universe: pd.DataFrame, fetched: Iterable[str], failed: Iterable[str],
+            yahoo_symbols: Iterable[str], min_dte: int, max_dte: int, now: Optional[float] = None) -> None:
+        """
+        Record a fetch made over fetch_window(min_dte, max_dte).
+
+        Args:
+            universe: prepare_universe output for the fetched symbols
+            fetched: Symbols whose fetch completed (with or without a chain)
+            failed: Symbols whose fetch raised
+            yahoo_symbols: Fetched symbols that used the Yahoo fallback
+        """
+        now = time.time() if now is None else now
+        fetched, failed = set(fetched), set(failed)
+        window = self.fetch_window(min_dte, max_dte, now)
+        if not self._valid(min_dte, max_dte, now):
+            self._reset(window[0], window[1], now)
+
+        if not universe.empty:
+            frames = [universe]
+            if not self.frame.empty:
+                frames.insert(0, self.frame[~self.frame['symbol'].isin(fetched)])
+            self.frame = pd.concat(frames, ignore_index=True)
+        self.covered |= fetched
+        self.failed = (self.failed | failed) - fetched
+        self.yahoo_symbols = (self.yahoo_symbols - fetched) | (set(yahoo_symbols) & fetched)
+
+        # Nothing usable (e.g. every fetch came back empty): do not serve it for a whole window
+        if self.frame.empty:
+            self._reset(None, None, None)
@@ -0,0 +1,232 @@
+"""
+Wire Format - Compact encodings for screen responses
+- Portions generated by AI
+
+The default JSON screen response is a list of row objects per symbol, so
+every column name is repeated on every row. Clients can ask for a compact
+form through the Accept header instead:
+- Columnar JSON: one array per column (always available)
+- Columnar MessagePack: the same structure in binary (needs msgpack)
+- Arrow IPC stream: one table for all symbols (needs pyarrow)
+
+Response metadata (screens_remaining, message, ...) travels in the body for
+the JSON/MessagePack forms and in the Arrow schema metadata for Arrow. The
+backend encodes with encode_screen_response; app.py sends accept_header()
+and decodes with decode_screen_response based on the response Content-Type.
+
+The streaming endpoint (NDJSON, one event per line) negotiates the same way
+between row objects and columnar NDJSON, where each symbol event carries its
+results as column arrays. app.py sends stream_accept_header() and parses
+each line with decode_stream_event, which accepts either form.
+
+JSON is written with orjson (NumPy arrays and scalars are serialized
+natively). orjson is a backend dependency; the Streamlit-only install falls
+back to the standard library encoder.
+"""
+
+import json
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+JSON = "application/json"
+COLUMNAR_JSON = "application/vnd.screener.columnar+json"
+COLUMNAR_MSGPACK = "application/vnd.screener.columnar+msgpack"
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+NDJSON = "application/x-ndjson"
+COLUMNAR_NDJSON = "application/vnd.screener.columnar+ndjson"
+
+
+def available_formats() -> list:
+    """Media types this process can encode and decode, most compact first"""
+    formats = []
+    if ARROW_AVAILABLE:
+        formats.append(ARROW_STREAM)
+    if MSGPACK_AVAILABLE:
+        formats.append(COLUMNAR_MSGPACK)
+    return formats + [COLUMNAR_JSON, JSON]
+
+
+def accept_header() -> str:
+    """Accept header preferring the most compact format this client can decode"""
+    formats = available_formats()
+    return ", ".join(
+        media_type if i == 0 else f"{media_type};q={1 - i / 10:.1f}"
+        for i, media_type in enumerate(formats)
+    )
+
+
+def stream_accept_header() -> str:
+    """Accept header for the streaming endpoint, preferring columnar NDJSON"""
+    return f"{COLUMNAR_NDJSON}, {NDJSON};q=0.9"
+
+
+def negotiate(accept: Optional[str], supported: Optional[list] = None, default: str = JSON) -> str:
+    """
+    Pick the response format for an Accept header.
+
+    The highest-q supported type wins (ties go to the one listed first).
+    Missing, wildcard-only or unsupported Accept headers get the default
+    (plain JSON), so existing clients are unaffected.
+    """
+    supported = available_formats() if supported is None else supported
+    best, best_q = default, 0.0
+    for item in (accept or "").split(","):
+        media_type, *params = [part.strip() for part in item.split(";")]
+        if media_type not in supported:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > best_q:
+            best, best_q = media_type, q
+    return best
+
+
+def _json_default(obj):
+    """Encode values neither JSON encoder handles natively"""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps_json(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON, including NumPy/pandas values"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=_json_default,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=_json_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def frame_rows(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Row dicts for JSON output. Values stay NumPy scalars for dumps_json,
+    which is much faster than DataFrame.to_dict(orient='records') boxing
+    every value into a Python object first. Missing values become None.
+    """
+    if df.isna().to_numpy().any():
+        df = df.astype(object).where(df.notna(), None)
+    columns = list(df.columns)
+    arrays = [df[column].to_numpy() for column in columns]
+    return [dict(zip(columns, values)) for values in zip(*arrays)]
+
+
+def _columns(df: pd.DataFrame) -> Dict[str, list]:
+    """Column name -> list of native values, with missing values as None"""
+    if df.isna().to_numpy().any():
+        df = df.astype(object).where(df.notna(), None)
+    return {column: df[column].to_numpy().tolist() for column in df.columns}
+
+
+def negotiate_stream(accept: Optional[str]) -> str:
+    """Pick the streaming response format: columnar NDJSON or plain (row) NDJSON"""
+    return negotiate(accept, [COLUMNAR_NDJSON, NDJSON], default=NDJSON)
+
+
+def stream_results(df: Optional[pd.DataFrame], media_type: str):
+    """Results field of a stream symbol event: column arrays for columnar NDJSON, else row dicts"""
+    if media_type == COLUMNAR_NDJSON:
+        return _columns(df) if df is not None else {}
+    return frame_rows(df) if df is not None else []
+
+
+def decode_stream_event(line: bytes) -> Dict[str, Any]:
+    """
+    Parse one line of a screen stream. A symbol event's results become a
+    DataFrame (empty when the symbol had no matches), from either form.
+    """
+    event = json.loads(line)
+    if event.get("type") == "symbol":
+        event["results"] = pd.DataFrame(event.get("results") or {})
+    return event
+
+
+def encode_screen_response(results: Dict[str, pd.DataFrame], meta: Dict[str, Any],
+                           media_type: str) -> bytes:
+    """
+    Encode screen results (symbol -> formatted DataFrame) plus response
+    metadata as one of the columnar formats.
+    """
+    if media_type == ARROW_STREAM:
+        symbols = list(results)
+        frames = [results[symbol] for symbol in symbols]
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        # Dictionary-encode repetitive text columns (symbol, expiry)
+        text_columns = df.select_dtypes(include=['object', 'string']).columns
+        df[text_columns] = df[text_columns].astype('category')
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        header = {**meta, "symbols": symbols, "rows": [len(frame) for frame in frames]}
+        table = table.replace_schema_metadata({b"screen": json.dumps(header).encode()})
+
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+    body = {**meta, "results": {symbol: _columns(df) for symbol, df in results.items()}}
+    if media_type == COLUMNAR_MSGPACK:
+        return msgpack.packb(body, use_bin_type=True)
+    if media_type == COLUMNAR_JSON:
+        return dumps_json(body)
+    raise ValueError(f"Unsupported screen response format: {media_type}")
+
+
+def decode_screen_response(content: bytes, media_type: str) -> Tuple[Dict[str, pd.DataFrame], Dict[str, Any]]:
+    """
+    Decode a screen response body of any supported format.
+
+    Returns:
+        (symbol -> DataFrame in response order, metadata dict)
+    """
+    media_type = (media_type or JSON).split(";")[0].strip()
+
+    if media_type == ARROW_STREAM:
+        table = pa.ipc.open_stream(content).read_all()
+        meta = json.loads(table.schema.metadata[b"screen"])
+        df = table.replace_schema_metadata(None).to_pandas()
+        for column in df.select_dtypes(include='category').columns:
+            df[column] = df[column].astype(object)
+        results, start = {}, 0
+        for symbol, rows in zip(meta.pop("symbols"), meta.pop("rows")):
+            results[symbol] = df.iloc[start:start + rows].reset_index(drop=True)
+            start += rows
+        return results, meta
+
+    if media_type == COLUMNAR_MSGPACK:
+        body = msgpack.unpackb(content, raw=False)
+    else:
+        body = json.loads(content)
+
+    # Columnar bodies hold dicts of column arrays; plain JSON holds row lists
+    results = {symbol: pd.DataFrame(data) for symbol, data in body.pop("results", {}).items() if data}
+    return results, body